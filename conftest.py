@@ -0,0 +1,7 @@
+import os
+import sys
+
+# 测试从项目根目录运行，统一添加后端源码路径
+_BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src', 'backend')
+if _BACKEND_DIR not in sys.path:
+    sys.path.insert(0, _BACKEND_DIR)
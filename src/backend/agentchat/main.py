@@ -58,6 +58,10 @@ async def init_config():
     await init_default_agent()
     await update_system_mcp_server()
 
+    # 按配置预热联网搜索客户端
+    from agentchat.tools.web_search.metaso_search.action import prewarm_metaso_client
+    prewarm_metaso_client()
+
 
 def print_logo():
     from pyfiglet import Figlet
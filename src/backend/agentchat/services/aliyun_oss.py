@@ -9,11 +9,14 @@ class AliyunOSSClient:
         self.bucket = oss2.Bucket(auth, app_settings.aliyun_oss["endpoint"], app_settings.aliyun_oss["bucket_name"])
 
     def upload_file(self, object_name, data):
+        """上传数据，成功时返回 put_object 的结果，失败时返回 None"""
         try:
             result = self.bucket.put_object(object_name, data)
             logger.info(f"File uploaded successfully, status code: {result.status}")
+            return result
         except oss2.exceptions.OssError as e:
             logger.error(f"Failed to upload file: {e}")
+            return None
 
     def upload_local_file(self, object_name, local_file):
         try:
@@ -22,6 +25,25 @@ class AliyunOSSClient:
         except oss2.exceptions.OssError as e:
             logger.error(f"Failed to upload file : {e}")
 
+    def upload_local_file_multipart(self, object_name, local_file, num_threads=4, part_size=5 * 1024 * 1024):
+        """
+        分片并发上传本地文件，文件小于 part_size 时退化为普通上传
+
+        Args:
+            object_name (str): OSS 对象名称
+            local_file (str): 本地文件路径
+            num_threads (int): 并发上传的线程数
+            part_size (int): 分片大小（字节）
+        """
+        try:
+            result = oss2.resumable_upload(self.bucket, object_name, local_file,
+                                           multipart_threshold=part_size,
+                                           part_size=part_size,
+                                           num_threads=num_threads)
+            logger.info(f"Local file uploaded successfully, status code: {result.status}")
+        except oss2.exceptions.OssError as e:
+            logger.error(f"Failed to upload file : {e}")
+
     def delete_bucket(self):
         try:
             self.bucket.delete_bucket()
@@ -30,6 +52,7 @@ class AliyunOSSClient:
             logger.error(f"Failed to delete bucket: {e}")
 
     def sign_url_for_get(self, object_name, expiration=3600):
+        """生成 GET 签名链接，签名在本地计算，不会发起网络请求"""
         try:
             url = self.bucket.sign_url("GET", object_name, expiration, slash_safe=True)
             return url
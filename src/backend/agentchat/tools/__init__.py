@@ -1,7 +1,7 @@
 from agentchat.tools.send_email.action import send_email
 from agentchat.tools.web_search.google_search.action import google_search
 from agentchat.tools.web_search.tavily_search.action import tavily_search
-from agentchat.tools.web_search.metaso_search.action import metaso_search
+from agentchat.tools.web_search.metaso_search.action import metaso_search, metaso_search_batch
 from agentchat.tools.arxiv.action import get_arxiv
 from agentchat.tools.get_weather.action import get_weather
 from agentchat.tools.delivery.action import get_delivery_info
@@ -16,6 +16,7 @@ AgentTools = [
     send_email,
     tavily_search,
     metaso_search,
+    metaso_search_batch,
     get_weather,
     get_arxiv,
     get_delivery_info,
@@ -32,6 +33,7 @@ AgentToolsWithName = {
     "tavily_search": tavily_search,
     "web_search": metaso_search,
     "metaso_search": metaso_search,
+    "metaso_search_batch": metaso_search_batch,
     "get_arxiv": get_arxiv,
     "get_weather": get_weather,
     "get_delivery": get_delivery_info,
@@ -1,28 +1,36 @@
+import io
 import os
+import re
+import copy
+import stat
+import atexit
 import tempfile
+import threading
+import time
 import zipfile
-from typing import List, Dict, Optional
+from typing import TYPE_CHECKING, Iterator, List, Dict, Optional, Tuple
 from pathlib import Path
 import json
-from datetime import datetime
 from loguru import logger
 
 from langchain.tools import tool
 
 from agentchat.services.aliyun_oss import aliyun_oss
-from agentchat.utils.file_utils import get_object_name_from_aliyun_url, get_save_tempfile
+from agentchat.utils.file_utils import get_object_name_from_aliyun_url
 from agentchat.utils.helpers import get_now_beijing_time
 from agentchat.settings import app_settings
 
-# 文件解析器
-from .parsers import PDFParser, DOCXParser, DOCParser, TXTParser, PPTParser
 # 翻译引擎
 from .translators import TranslationEngine
-# 文件生成器
-from .generators import DocumentGenerator
+# 文件解析器（各解析库在首次创建对应解析器时才导入）
+from .parsers import ParserFactory
 # 工具函数
 from .utils import validate_file_size, get_file_extension, create_progress_tracker
 
+if TYPE_CHECKING:
+    # 文件生成器依赖 reportlab/docx/pptx 等较重的库，运行时在首次翻译时才导入
+    from .generators import DocumentGenerator
+
 SUPPORTED_FORMATS = ['.pdf', '.docx', '.doc', '.txt', '.ppt', '.pptx']
 MAX_FILE_SIZE = 50 * 1024 * 1024  # 50MB
 SUPPORTED_LANGUAGES = {
@@ -36,6 +44,21 @@ SUPPORTED_LANGUAGES = {
     'ru': 'Русский'
 }
 
+# 进程内共用的解析器工厂，按扩展名和解析参数复用解析器实例
+_PARSER_FACTORY = ParserFactory()
+
+# 进程内共用的翻译引擎，跨工具调用复用 HTTP 连接和翻译缓存
+_TRANSLATION_ENGINE: Optional[TranslationEngine] = None
+_TRANSLATION_ENGINE_LOCK = threading.Lock()
+
+# 仅由数字、符号和空白组成的片段无需翻译
+_SKIP_RE = re.compile(r'^[\s\d\W_]+$')
+# URL 和邮箱地址保持原样
+_URL_OR_EMAIL_RE = re.compile(
+    r'^\s*(?:(?:https?|ftp)://\S+|www\.\S+|[\w.+-]+@[\w-]+(?:\.[\w-]+)+)\s*$',
+    re.IGNORECASE
+)
+
 @tool(parse_docstring=True)
 def document_translation(
     file_urls: List[str],
@@ -81,70 +104,83 @@ def _document_translation(
         
         # 获取文档翻译配置
         translation_config = getattr(app_settings.tools, 'document_translation', {})
-        translation_engine = TranslationEngine(config=translation_config)
+        translation_engine = get_translation_engine(translation_config)
         
+        # 延迟导入文件生成器，避免服务启动时加载全部文档库
+        from .generators import DocumentGenerator
         doc_generator = DocumentGenerator()
         
-        # 文件处理结果
-        processed_files = []
-        failed_files = []
+        # 相同链接只处理一次，结果按原始顺序回填
+        unique_urls = list(dict.fromkeys(file_urls))
+        url_to_result: Dict[str, Tuple[Optional[Dict], Optional[str]]] = {}
         
         # 处理每个文件
-        for idx, file_url in enumerate(file_urls):
+        for idx, file_url in enumerate(unique_urls):
             try:
-                # 更新进度
-                progress_tracker.update(f"正在处理第 {idx + 1}/{len(file_urls)} 个文件...")
-                
-                # 下载和验证文件
-                file_info = download_and_validate_file(file_url)
-                if not file_info:
-                    failed_files.append(f"文件 {file_url}: 下载或验证失败")
-                    continue
-                
-                # 解析文件
-                progress_tracker.update(f"正在解析 {file_info['filename']}...")
-                parsed_content = parse_document(file_info)
-                if not parsed_content:
-                    failed_files.append(f"文件 {file_info['filename']}: 解析失败")
-                    continue
-                
-                # 翻译内容
-                progress_tracker.update(f"正在翻译 {file_info['filename']}...")
-                translated_content = translate_content(
-                    parsed_content, 
-                    source_language, 
-                    target_language,
-                    translation_engine
-                )
-                
-                # 生成翻译文档
-                progress_tracker.update(f"正在生成翻译文档 {file_info['filename']}...")
-                output_file = generate_translated_document(
-                    file_info,
-                    translated_content,
-                    target_language,
-                    preserve_formatting,
-                    doc_generator
-                )
-                
-                # 上传翻译后的文件
-                progress_tracker.update(f"正在上传翻译文档 {file_info['filename']}...")
-                download_url = upload_translated_file(output_file, file_info)
-                
-                processed_files.append({
-                    'original_name': file_info['filename'],
-                    'translated_url': download_url,
-                    'target_language': SUPPORTED_LANGUAGES[target_language]
-                })
-                
-                # 清理临时文件
-                cleanup_temp_files(file_info)
+                # 每个文件使用独立的临时目录，处理完成后整体删除
+                with tempfile.TemporaryDirectory(prefix='doctrans_') as workdir:
+                    # 更新进度（每个文件只记录一次）
+                    progress_tracker.update(f"正在处理第 {idx + 1}/{len(unique_urls)} 个文件...")
+                    
+                    # 下载和验证文件
+                    file_info = download_and_validate_file(file_url, workdir)
+                    if not file_info:
+                        url_to_result[file_url] = (None, f"文件 {file_url}: 下载或验证失败")
+                        continue
+                    
+                    # 解析文件
+                    parsed_content = parse_document(file_info, preserve_formatting, translation_config)
+                    if not parsed_content:
+                        url_to_result[file_url] = (None, f"文件 {file_info['filename']}: 解析失败")
+                        continue
+                    
+                    # 翻译内容
+                    translated_content = translate_content(
+                        parsed_content, 
+                        source_language, 
+                        target_language,
+                        translation_engine
+                    )
+                    
+                    # 生成翻译文档
+                    output_file = generate_translated_document(
+                        file_info,
+                        translated_content,
+                        target_language,
+                        preserve_formatting,
+                        doc_generator,
+                        workdir
+                    )
+                    
+                    # 上传翻译后的文件
+                    download_url = upload_translated_file(output_file, file_info)
+                    
+                    url_to_result[file_url] = ({
+                        'original_name': file_info['filename'],
+                        'translated_url': download_url,
+                        'target_language': SUPPORTED_LANGUAGES[target_language]
+                    }, None)
+                    logger.opt(lazy=True).info(
+                        "文档翻译完成: {file} -> {url}",
+                        file=lambda: file_info['filename'],
+                        url=lambda: download_url
+                    )
                 
             except Exception as e:
                 logger.error(f"处理文件 {file_url} 时出错: {str(e)}")
-                failed_files.append(f"文件 {file_url}: {str(e)}")
+                url_to_result[file_url] = (None, f"文件 {file_url}: {str(e)}")
                 continue
         
+        # 文件处理结果
+        processed_files = []
+        failed_files = []
+        for file_url in file_urls:
+            processed, failure = url_to_result[file_url]
+            if processed:
+                processed_files.append(processed)
+            else:
+                failed_files.append(failure)
+        
         # 生成结果信息
         return generate_result_message(processed_files, failed_files, progress_tracker)
         
@@ -152,23 +188,45 @@ def _document_translation(
         logger.error(f"文档翻译过程出错: {str(e)}")
         return f"文档翻译失败：{str(e)}"
 
-def download_and_validate_file(file_url: str) -> Optional[Dict]:
+def get_translation_engine(config: Optional[Dict] = None) -> TranslationEngine:
+    """获取进程内共用的翻译引擎，配置变化时重新创建"""
+    global _TRANSLATION_ENGINE
+    config = config or {}
+    with _TRANSLATION_ENGINE_LOCK:
+        if _TRANSLATION_ENGINE is None or _TRANSLATION_ENGINE.config != config:
+            # 旧引擎可能仍被进行中的调用使用，不主动关闭，由垃圾回收释放
+            _TRANSLATION_ENGINE = TranslationEngine(config=config)
+        return _TRANSLATION_ENGINE
+
+def _close_translation_engine():
+    """进程退出时释放翻译引擎持有的 HTTP 连接池、线程池和持久化缓存"""
+    with _TRANSLATION_ENGINE_LOCK:
+        if _TRANSLATION_ENGINE is not None:
+            _TRANSLATION_ENGINE.close()
+
+atexit.register(_close_translation_engine)
+
+def download_and_validate_file(file_url: str, workdir: str) -> Optional[Dict]:
     """下载并验证文件"""
     try:
-        # 从阿里云下载文件
+        # 从阿里云下载文件到工作目录
         object_name = get_object_name_from_aliyun_url(file_url)
         file_name = file_url.split("/")[-1]
-        file_path = get_save_tempfile(file_name)
+        file_path = os.path.join(workdir, os.path.basename(file_name))
         
         # 下载文件
         aliyun_oss.download_file(object_name, file_path)
         
-        # 验证文件是否存在
-        if not os.path.isfile(file_path):
+        # 验证文件是否存在（一次 stat 同时取得文件类型和大小）
+        try:
+            file_stat = os.stat(file_path)
+        except FileNotFoundError:
+            return None
+        if not stat.S_ISREG(file_stat.st_mode):
             return None
         
         # 验证文件大小
-        file_size = os.path.getsize(file_path)
+        file_size = file_stat.st_size
         if file_size > MAX_FILE_SIZE:
             os.remove(file_path)
             return None
@@ -191,24 +249,30 @@ def download_and_validate_file(file_url: str) -> Optional[Dict]:
         logger.error(f"文件下载验证失败: {str(e)}")
         return None
 
-def parse_document(file_info: Dict) -> Optional[Dict]:
+def _parser_options(file_ext: str, preserve_formatting: bool, config: Optional[Dict] = None) -> Dict:
+    """按生成端实际用到的内容和翻译配置确定解析器参数"""
+    if file_ext == '.pdf':
+        # PDF 文本块只随内容传递，生成时不使用，无需逐 span 字号
+        options = {'block_details': False}
+        # 大文件多进程并行解析需在配置中显式开启
+        parallel_min_pages = (config or {}).get('pdf_parallel_min_pages')
+        if parallel_min_pages:
+            options['parallel_min_pages'] = int(parallel_min_pages)
+        return options
+    if file_ext == '.docx' and not preserve_formatting:
+        # 不保持格式时生成端不使用文本运行
+        return {'extract_runs': False}
+    return {}
+
+def parse_document(file_info: Dict, preserve_formatting: bool = True, config: Optional[Dict] = None) -> Optional[Dict]:
     """解析文档内容"""
     try:
         file_path = file_info['filepath']
         file_ext = file_info['extension']
         
         # 根据文件类型选择解析器
-        if file_ext == '.pdf':
-            parser = PDFParser()
-        elif file_ext == '.docx':
-            parser = DOCXParser()
-        elif file_ext == '.doc':
-            parser = DOCParser()
-        elif file_ext == '.txt':
-            parser = TXTParser()
-        elif file_ext in ['.ppt', '.pptx']:
-            parser = PPTParser()
-        else:
+        parser = _PARSER_FACTORY.get_parser(file_ext, **_parser_options(file_ext, preserve_formatting, config))
+        if parser is None:
             return None
         
         return parser.parse(file_path)
@@ -217,6 +281,67 @@ def parse_document(file_info: Dict) -> Optional[Dict]:
         logger.error(f"文档解析失败: {str(e)}")
         return None
 
+def _dominant_language(text: str) -> Optional[str]:
+    """根据书写系统判断文本主要语言，仅识别可由文字唯一确定的 zh/ja/ko/ru"""
+    letters = han = kana = hangul = cyrillic = 0
+    for ch in text:
+        if not ch.isalpha():
+            continue
+        letters += 1
+        code = ord(ch)
+        if 0x4e00 <= code <= 0x9fff:
+            han += 1
+        elif 0x3040 <= code <= 0x30ff:
+            kana += 1
+        elif 0xac00 <= code <= 0xd7af:
+            hangul += 1
+        elif 0x0400 <= code <= 0x04ff:
+            cyrillic += 1
+    
+    if not letters:
+        return None
+    if kana and (kana + han) * 2 > letters:
+        return 'ja'
+    if han * 2 > letters:
+        return 'zh'
+    if hangul * 2 > letters:
+        return 'ko'
+    if cyrillic * 2 > letters:
+        return 'ru'
+    return None
+
+def _should_translate(text: str, target_lang: str) -> bool:
+    """判断文本片段是否需要调用翻译接口"""
+    if _SKIP_RE.match(text) or _URL_OR_EMAIL_RE.match(text):
+        return False
+    # 已经是目标语言的片段直接保留
+    return _dominant_language(text) != target_lang
+
+def _iter_segments(content: Dict) -> Iterator[str]:
+    """按翻译顺序列出内容中需要翻译的全部文本片段"""
+    pages = content.get('pages')
+    for page in pages or ():
+        if page.get('text'):
+            yield page['text']
+    
+    paragraphs = content.get('paragraphs')
+    for para in paragraphs or ():
+        if para.get('text'):
+            yield para['text']
+        for run in para.get('runs') or ():
+            if run.get('text'):
+                yield run['text']
+    
+    for table in content.get('tables') or ():
+        for row in table:
+            for cell_text in row:
+                if cell_text and isinstance(cell_text, str) and cell_text.strip():
+                    yield cell_text
+    
+    # 没有结构化内容时翻译全文文本
+    if not pages and not paragraphs and content.get('text'):
+        yield content['text']
+
 def translate_content(
     content: Dict, 
     source_lang: str, 
@@ -225,68 +350,56 @@ def translate_content(
 ) -> Dict:
     """翻译文档内容"""
     try:
-        translated_content = content.copy()
+        # 文档内重复出现的片段（页眉、页脚、表头等）只翻译一次
+        # 直接以文本作为键，复用 str 自身缓存的哈希值，无需额外计算摘要
+        translated_segments: Dict[str, str] = {text: text for text in _iter_segments(content)}
+        
+        # 需要翻译的片段先收集起来，按批次提交给翻译引擎，减少API请求次数
+        to_translate = [text for text in translated_segments if _should_translate(text, target_lang)]
+        if to_translate:
+            translated_segments.update(zip(to_translate, translator.translate_batch(
+                to_translate,
+                source_language=source_lang,
+                target_language=target_lang
+            )))
+        _translate = translated_segments.__getitem__
+        
+        # 整体复制一次，之后原地替换文本，避免逐页/段落/run 复制字典
+        translated_content = copy.deepcopy(content)
         has_structural_translation = False
         
         # 1. 翻译结构化内容
         
         # 翻译 pages (PDF)
-        if 'pages' in content and content['pages']:
-            translated_pages = []
-            for page in content['pages']:
-                new_page = page.copy()
-                if 'text' in page and page['text']:
-                    new_page['text'] = translator.translate(
-                        page['text'],
-                        source_language=source_lang,
-                        target_language=target_lang
-                    )
-                translated_pages.append(new_page)
-            translated_content['pages'] = translated_pages
+        pages = translated_content.get('pages')
+        if pages:
+            for page in pages:
+                if page.get('text'):
+                    page['text'] = _translate(page['text'])
             has_structural_translation = True
             
             # 从翻译后的页面重构全文文本
-            translated_content['text'] = '\n\n'.join([p.get('text', '') for p in translated_pages])
+            translated_content['text'] = '\n\n'.join([p.get('text', '') for p in pages])
 
         # 翻译 paragraphs (DOCX/DOC)
-        if 'paragraphs' in content and content['paragraphs']:
-            translated_paragraphs = []
+        paragraphs = translated_content.get('paragraphs')
+        if paragraphs:
             full_text_parts = []
             
-            for para in content['paragraphs']:
-                new_para = para.copy()
-                
+            for para in paragraphs:
                 # 翻译段落文本
-                if 'text' in para and para['text']:
-                    new_para['text'] = translator.translate(
-                        para['text'],
-                        source_language=source_lang,
-                        target_language=target_lang
-                    )
+                if para.get('text'):
+                    para['text'] = _translate(para['text'])
                 
                 # 翻译 runs (用于保留样式)
-                if 'runs' in para and para['runs']:
-                    new_runs = []
-                    for run in para['runs']:
-                        new_run = run.copy()
-                        if 'text' in run and run['text']:
-                            new_run['text'] = translator.translate(
-                                run['text'],
-                                source_language=source_lang,
-                                target_language=target_lang
-                            )
-                        new_runs.append(new_run)
-                    new_para['runs'] = new_runs
-                    
-                    # 如果有 runs，段落文本应该是 runs 的组合
-                    # 但为了简单，我们优先信任 runs 的翻译结果组合（如果有）
-                    # 或者保持 new_para['text'] 的独立翻译结果
+                # 段落文本保持独立翻译结果，runs 仅用于生成时还原样式
+                for run in para.get('runs') or ():
+                    if run.get('text'):
+                        run['text'] = _translate(run['text'])
                 
-                translated_paragraphs.append(new_para)
-                if new_para.get('text'):
-                    full_text_parts.append(new_para['text'])
+                if para.get('text'):
+                    full_text_parts.append(para['text'])
             
-            translated_content['paragraphs'] = translated_paragraphs
             has_structural_translation = True
             
             # 更新全文文本 (如果没有 pages 更新过)
@@ -294,37 +407,20 @@ def translate_content(
                 translated_content['text'] = '\n\n'.join(full_text_parts)
 
         # 翻译 tables (DOCX)
-        if 'tables' in content and content['tables']:
-            translated_tables = []
-            for table in content['tables']:
-                new_table = []
+        tables = translated_content.get('tables')
+        if tables:
+            for table in tables:
                 for row in table:
-                    new_row = []
-                    for cell_text in row:
+                    for col_idx, cell_text in enumerate(row):
                         if cell_text and isinstance(cell_text, str) and cell_text.strip():
-                            new_cell_text = translator.translate(
-                                cell_text,
-                                source_language=source_lang,
-                                target_language=target_lang
-                            )
-                            new_row.append(new_cell_text)
-                        else:
-                            new_row.append(cell_text)
-                    new_table.append(new_row)
-                translated_tables.append(new_table)
-            translated_content['tables'] = translated_tables
+                            row[col_idx] = _translate(cell_text)
             # 表格通常不计入 content['text'] 的主要部分，或者解析器已处理
         
         # 2. 如果没有结构化内容，翻译全文文本 (如 TXT)
         if not has_structural_translation:
             text_content = content.get('text', '')
             if text_content:
-                translated_text = translator.translate(
-                    text_content,
-                    source_language=source_lang,
-                    target_language=target_lang
-                )
-                translated_content['text'] = translated_text
+                translated_content['text'] = _translate(text_content)
         
         translated_content['translated_language'] = target_lang
         
@@ -339,7 +435,8 @@ def generate_translated_document(
     translated_content: Dict,
     target_language: str,
     preserve_formatting: bool,
-    generator: DocumentGenerator
+    generator: 'DocumentGenerator',
+    output_dir: str
 ) -> str:
     """生成翻译后的文档"""
     try:
@@ -347,11 +444,15 @@ def generate_translated_document(
         file_ext = file_info['extension']
         
         # 生成输出文件路径
-        output_dir = tempfile.mkdtemp()
         base_name = os.path.splitext(file_info['filename'])[0]
         output_filename = f"{base_name}_translated_{target_language}{file_ext}"
         output_path = os.path.join(output_dir, output_filename)
         
+        # TXT 无需排版，直接写出译文
+        if file_ext == '.txt':
+            Path(output_path).write_text(translated_content.get('text', ''), encoding='utf-8')
+            return output_path
+        
         # 生成文档
         generator.generate(
             translated_content,
@@ -370,12 +471,12 @@ def upload_translated_file(output_file: str, file_info: Dict) -> str:
     """上传翻译后的文件"""
     try:
         # 生成阿里云对象名称
-        timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+        token = f"{time.time_ns():x}"
         output_filename = os.path.basename(output_file)
-        oss_object_name = f"document_translation/{timestamp}_{output_filename}"
+        oss_object_name = f"document_translation/{token}_{output_filename}"
         
-        # 上传到阿里云
-        aliyun_oss.upload_local_file(oss_object_name, output_file)
+        # 分片并发上传到阿里云，大文件不再受单连接带宽限制
+        aliyun_oss.upload_local_file_multipart(oss_object_name, output_file)
         
         # 生成签名URL
         download_url = aliyun_oss.sign_url_for_get(oss_object_name)
@@ -386,14 +487,6 @@ def upload_translated_file(output_file: str, file_info: Dict) -> str:
         logger.error(f"文件上传失败: {str(e)}")
         raise e
 
-def cleanup_temp_files(file_info: Dict):
-    """清理临时文件"""
-    try:
-        if os.path.exists(file_info['filepath']):
-            os.remove(file_info['filepath'])
-    except Exception as e:
-        logger.warning(f"清理临时文件失败: {str(e)}")
-
 def generate_result_message(
     processed_files: List[Dict], 
     failed_files: List[str], 
@@ -404,29 +497,27 @@ def generate_result_message(
     if not processed_files and not failed_files:
         return "没有文件被处理，请检查文件格式和大小限制。"
     
-    result_parts = []
+    buf = io.StringIO()
+    write = buf.write
     
     # 成功处理的文件
     if processed_files:
-        result_parts.append("✅ 翻译完成！")
-        result_parts.append("")
-        
+        write("✅ 翻译完成！\n\n")
         for file_info in processed_files:
-            result_parts.append(
-                f"📄 {file_info['original_name']} -> {file_info['target_language']}"
+            write(
+                f"📄 {file_info['original_name']} -> {file_info['target_language']}\n"
+                f"[点击下载翻译文件]({file_info['translated_url']})\n\n"
             )
-            result_parts.append(f"[点击下载翻译文件]({file_info['translated_url']})")
-            result_parts.append("")
     
     # 失败的文件
     if failed_files:
-        result_parts.append("❌ 以下文件处理失败：")
+        write("❌ 以下文件处理失败：\n")
         for failure in failed_files:
-            result_parts.append(f"  • {failure}")
-        result_parts.append("")
+            write(f"  • {failure}\n")
+        write("\n")
     
     # 添加时间限制提示
     now_time = get_now_beijing_time(delta=1)
-    result_parts.append(f"⏰ 请在 {now_time} 前下载文件，超过时间链接将失效")
+    write(f"⏰ 请在 {now_time} 前下载文件，超过时间链接将失效")
     
-    return "\n".join(result_parts)
\ No newline at end of file
+    return buf.getvalue()
\ No newline at end of file
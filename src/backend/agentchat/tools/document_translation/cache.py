@@ -0,0 +1,133 @@
+"""
+翻译结果持久化缓存模块
+支持SQLite本地文件和Redis两种存储，进程重启后相同文本无需重新翻译
+"""
+
+import os
+import time
+import sqlite3
+import hashlib
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Tuple
+from loguru import logger
+
+# 缓存条目默认有效期（秒），过期后重新翻译
+DEFAULT_CACHE_TTL = 7 * 86400
+
+# SQLite 单条语句的参数个数上限以内分批查询
+_SQLITE_QUERY_CHUNK = 500
+
+def make_cache_key(text: str, source_language: str, target_language: str) -> str:
+    """根据文本内容摘要和语言对生成缓存键"""
+    digest = hashlib.md5(text.encode('utf-8')).hexdigest()
+    return f"tr:{source_language}:{target_language}:{digest}"
+
+class TranslationCache(ABC):
+    """翻译结果缓存基类"""
+    
+    def __init__(self, ttl: int = DEFAULT_CACHE_TTL):
+        self.ttl = ttl
+    
+    @abstractmethod
+    def get_many(self, keys: List[str]) -> List[Optional[str]]:
+        """批量读取缓存，结果与 keys 顺序一致，未命中为 None"""
+        pass
+    
+    @abstractmethod
+    def set_many(self, items: List[Tuple[str, str]]):
+        """批量写入缓存"""
+        pass
+    
+    def close(self):
+        """释放缓存占用的连接"""
+        pass
+
+class SQLiteTranslationCache(TranslationCache):
+    """基于本地SQLite文件的翻译缓存"""
+    
+    def __init__(self, path: Optional[str] = None, ttl: int = DEFAULT_CACHE_TTL):
+        super().__init__(ttl)
+        self.path = path or os.path.join(tempfile.gettempdir(), 'doc_translation_cache.sqlite3')
+        # 翻译引擎在线程池中并发访问，共用一个连接并加锁
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        with self._lock:
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS translations '
+                '(key TEXT PRIMARY KEY, value TEXT NOT NULL, expire_at REAL NOT NULL)'
+            )
+            # 打开时顺带清理已过期的条目
+            self._conn.execute('DELETE FROM translations WHERE expire_at <= ?', (time.time(),))
+            self._conn.commit()
+    
+    def get_many(self, keys: List[str]) -> List[Optional[str]]:
+        found: Dict[str, str] = {}
+        now = time.time()
+        with self._lock:
+            for start in range(0, len(keys), _SQLITE_QUERY_CHUNK):
+                chunk = keys[start:start + _SQLITE_QUERY_CHUNK]
+                placeholders = ','.join('?' * len(chunk))
+                rows = self._conn.execute(
+                    f'SELECT key, value FROM translations WHERE key IN ({placeholders}) AND expire_at > ?',
+                    (*chunk, now)
+                ).fetchall()
+                found.update(rows)
+        return [found.get(key) for key in keys]
+    
+    def set_many(self, items: List[Tuple[str, str]]):
+        expire_at = time.time() + self.ttl
+        with self._lock:
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO translations (key, value, expire_at) VALUES (?, ?, ?)',
+                [(key, value, expire_at) for key, value in items]
+            )
+            self._conn.commit()
+    
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+class RedisTranslationCache(TranslationCache):
+    """基于项目Redis服务的翻译缓存，多个服务进程之间共享"""
+    
+    def __init__(self, ttl: int = DEFAULT_CACHE_TTL):
+        super().__init__(ttl)
+        from agentchat.services.redis import redis_client
+        self._redis = redis_client.connection
+    
+    def get_many(self, keys: List[str]) -> List[Optional[str]]:
+        values = self._redis.mget(keys)
+        return [value.decode('utf-8') if value is not None else None for value in values]
+    
+    def set_many(self, items: List[Tuple[str, str]]):
+        # 一次往返写入全部条目
+        pipeline = self._redis.pipeline(transaction=False)
+        for key, value in items:
+            pipeline.setex(key, self.ttl, value.encode('utf-8'))
+        pipeline.execute()
+
+def create_translation_cache(config: Dict) -> Optional[TranslationCache]:
+    """
+    按配置创建持久化翻译缓存
+    
+    Args:
+        config: 翻译配置，cache_backend 可选 memory（默认，不持久化）、disk、redis
+    
+    Returns:
+        缓存实例，未启用或创建失败时返回 None
+    """
+    backend = config.get('cache_backend', 'memory')
+    ttl = int(config.get('cache_ttl', DEFAULT_CACHE_TTL))
+    try:
+        if backend == 'disk':
+            return SQLiteTranslationCache(config.get('cache_path'), ttl=ttl)
+        if backend == 'redis':
+            return RedisTranslationCache(ttl=ttl)
+        if backend != 'memory':
+            logger.warning(f"未知的翻译缓存类型: {backend}，仅使用内存缓存")
+    except Exception as e:
+        logger.error(f"翻译缓存初始化失败: {str(e)}")
+    return None
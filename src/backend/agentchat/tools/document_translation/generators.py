@@ -3,13 +3,157 @@
 将翻译后的内容重新生成各种格式的文档
 """
 
+import gc
+import io
 import os
+import sys
 import tempfile
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Any
-from pathlib import Path
+from typing import IO, Dict, List, NamedTuple, Optional, Tuple, Any
 from loguru import logger
 
+from .utils import iter_paragraphs
+
+# 文档库在模块加载时导入一次，未安装时对应生成器在创建时报错
+try:
+    from reportlab.lib.pagesizes import A4
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.ttfonts import TTFont
+except ImportError:
+    SimpleDocTemplate = None
+
+try:
+    from docx import Document
+    from docx.shared import Pt, RGBColor
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+    from docx.oxml.ns import qn
+    from lxml import etree
+    
+    # 段落对齐方式映射
+    _ALIGN_MAP = {
+        'CENTER': WD_ALIGN_PARAGRAPH.CENTER,
+        'RIGHT': WD_ALIGN_PARAGRAPH.RIGHT,
+        'LEFT': WD_ALIGN_PARAGRAPH.LEFT
+    }
+except ImportError:
+    Document = None
+    _ALIGN_MAP = {}
+
+try:
+    from pptx import Presentation
+except ImportError:
+    Presentation = None
+
+# 输出文件扩展名 -> 生成器键
+_EXT_TO_KEY = {
+    '.pdf': 'pdf',
+    '.docx': 'docx',
+    '.txt': 'txt',
+    '.ppt': 'ppt',
+    '.pptx': 'pptx'
+}
+
+# 为 True 时每生成一个文档后完整回收一次，长期运行的批量服务中避免内存碎片持续增长
+_AGGRESSIVE_GC = False
+# 长期存活的文档库对象是否已移出分代回收（进程内只执行一次）
+_GC_FROZEN = False
+
+# 段落数超过该值时，DOCX 正文直接以 XML 元素写入
+_DOCX_FAST_PATH_THRESHOLD = 500
+# 对齐方式 -> w:jc 取值
+_JC_VALUES = {
+    'CENTER': 'center',
+    'RIGHT': 'right',
+    'LEFT': 'left'
+}
+
+# 样式名（已驻留）-> 标题级别，非标题样式为 0
+_HEADING_LEVELS: Dict[str, int] = {}
+
+def _heading_level(style: Optional[str]) -> int:
+    """获取样式对应的标题级别，同名样式只解析一次"""
+    if not style:
+        return 0
+    level = _HEADING_LEVELS.get(style)
+    if level is None:
+        # 标题样式名中含 "1" 的按一级标题处理，其余标题按二级标题处理
+        if 'Heading' in style:
+            level = 1 if '1' in style else 2
+        else:
+            level = 0
+        _HEADING_LEVELS[sys.intern(style)] = level
+    return level
+
+# 进程内已注册的字体，字体文件只读取和解析一次
+_REGISTERED_FONTS: set = set()
+# Windows 字体目录文件表（小写文件名 -> 路径），首次使用时扫描一次
+_WINDOWS_FONT_DIR = "C:/Windows/Fonts"
+_WINDOWS_FONT_FILES: Optional[Dict[str, str]] = None
+
+def _get_windows_font_files() -> Dict[str, str]:
+    """获取Windows字体目录下的字体文件"""
+    global _WINDOWS_FONT_FILES
+    if _WINDOWS_FONT_FILES is None:
+        try:
+            with os.scandir(_WINDOWS_FONT_DIR) as entries:
+                _WINDOWS_FONT_FILES = {entry.name.lower(): entry.path for entry in entries}
+        except OSError:
+            _WINDOWS_FONT_FILES = {}
+    return _WINDOWS_FONT_FILES
+
+# 文本运行：(text, bold, italic, underline, font_size)
+RunTuple = Tuple[str, Any, Any, Any, Any]
+
+class ContentView(NamedTuple):
+    """段落内容的列式视图，各字段按段落下标一一对应"""
+    texts: List[str]
+    styles: List[Optional[str]]
+    alignments: List[Optional[str]]
+    runs: List[Optional[List[RunTuple]]]
+
+def _to_content_view(paragraphs) -> ContentView:
+    """将段落字典列表转换为 ContentView，已转换过的直接返回"""
+    if isinstance(paragraphs, ContentView):
+        return paragraphs
+    
+    texts, styles, alignments, runs = [], [], [], []
+    for para_info in paragraphs:
+        text = para_info.get('text')
+        if not text:
+            continue
+        texts.append(text)
+        # 样式名大量重复，驻留后字典查找可直接按对象比较
+        style = para_info.get('style')
+        styles.append(sys.intern(style) if isinstance(style, str) else style)
+        alignments.append((para_info['alignment'] or 'LEFT') if 'alignment' in para_info else None)
+        
+        para_runs = para_info.get('runs')
+        if para_runs:
+            runs.append([
+                (run_info.get('text'), run_info.get('bold'), run_info.get('italic'),
+                 run_info.get('underline'), run_info.get('font_size'))
+                for run_info in para_runs
+                if run_info.get('text')
+            ])
+        else:
+            runs.append(None)
+    return ContentView(texts, styles, alignments, runs)
+
+def _is_empty_content(content: Dict) -> bool:
+    """内容中没有任何可输出的正文、结构或标题"""
+    if not content:
+        return True
+    return not (
+        content.get('text')
+        or content.get('pages')
+        or content.get('paragraphs')
+        or content.get('tables')
+        or content.get('slides')
+        or (content.get('metadata') or {}).get('title')
+    )
+
 class BaseGenerator(ABC):
     """基础生成器类"""
     
@@ -27,41 +171,60 @@ class PDFGenerator(BaseGenerator):
     """PDF文档生成器"""
     
     def __init__(self):
-        try:
-            from reportlab.lib.pagesizes import letter, A4
-            from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak
-            from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-            from reportlab.lib.units import inch
-            from reportlab.pdfbase import pdfmetrics
-            from reportlab.pdfbase.ttfonts import TTFont
-            
-            self.letter = letter
-            self.A4 = A4
-            self.SimpleDocTemplate = SimpleDocTemplate
-            self.Paragraph = Paragraph
-            self.Spacer = Spacer
-            self.PageBreak = PageBreak
-            self.getSampleStyleSheet = getSampleStyleSheet
-            self.ParagraphStyle = ParagraphStyle
-            self.inch = inch
-            self.pdfmetrics = pdfmetrics
-            self.TTFont = TTFont
-            
-            # 注册中文字体
-            try:
-                self._register_chinese_fonts()
-            except Exception as e:
-                logger.warning(f"注册中文字体失败: {str(e)}")
-                
-        except ImportError:
+        if SimpleDocTemplate is None:
             logger.error("reportlab库未安装，无法生成PDF文件")
-            raise
+            raise ImportError("reportlab库未安装")
+        
+        # 注册中文字体
+        try:
+            self._register_chinese_fonts()
+        except Exception as e:
+            logger.warning(f"注册中文字体失败: {str(e)}")
+        
+        # 样式只创建一次，多次生成复用
+        self._init_styles()
     
     def supports_format(self, format_type: str) -> bool:
         return format_type.lower() == 'pdf'
     
+    def _init_styles(self):
+        """创建生成PDF所需的段落样式"""
+        styles = getSampleStyleSheet()
+        
+        self._chinese_style = ParagraphStyle(
+            'ChineseStyle',
+            parent=styles['Normal'],
+            fontName='SimSun',
+            fontSize=12,
+            # 段后距包含原先每段后追加的 Spacer(1, 6)，不再单独插入间隔
+            spaceAfter=18,
+            leading=14
+        )
+        
+        self._title_style = ParagraphStyle(
+            'TitleStyle',
+            parent=styles['Title'],
+            fontName='SimSun',
+            fontSize=18,
+            spaceAfter=20,
+            alignment=1  # 居中
+        )
+        
+        self._notice_style = ParagraphStyle(
+            'NoticeStyle',
+            parent=styles['Normal'],
+            fontName='SimSun',
+            fontSize=10,
+            textColor='gray',
+            alignment=1  # 居中
+        )
+    
     def _register_chinese_fonts(self):
         """注册中文字体"""
+        # 字体注册在进程内全局生效，已注册过则直接跳过
+        if _REGISTERED_FONTS:
+            return
+        
         # 尝试注册常用的中文字体
         chinese_fonts = [
             ('SimSun', 'simsun.ttc'),
@@ -69,87 +232,80 @@ class PDFGenerator(BaseGenerator):
             ('SimHei', 'simhei.ttf')
         ]
         
+        font_files = _get_windows_font_files()
         for font_name, font_file in chinese_fonts:
+            font_path = font_files.get(font_file)
+            if not font_path:
+                continue
             try:
-                if os.path.exists(f"C:/Windows/Fonts/{font_file}"):
-                    self.pdfmetrics.registerFont(self.TTFont(font_name, f"C:/Windows/Fonts/{font_file}"))
-                    logger.info(f"注册字体成功: {font_name}")
-                    break
+                pdfmetrics.registerFont(TTFont(font_name, font_path))
+                _REGISTERED_FONTS.add(font_name)
+                logger.info(f"注册字体成功: {font_name}")
+                break
             except Exception as e:
                 logger.warning(f"注册字体 {font_name} 失败: {str(e)}")
     
-    def generate(self, content: Dict, output_path: str, original_path: str = None, preserve_formatting: bool = True) -> bool:
-        """生成PDF文档"""
+    def generate(self, content: Dict, output_path: str, original_path: str = None, preserve_formatting: bool = True,
+                 output_stream: Optional[IO[bytes]] = None) -> bool:
+        """
+        生成PDF文档
+        
+        传入 output_stream 时直接写入该文件对象，不落盘；
+        否则先在内存中生成，再一次性写入 output_path。
+        """
         try:
             # 创建PDF文档
-            doc = self.SimpleDocTemplate(output_path, pagesize=self.A4)
+            buffer = output_stream if output_stream is not None else io.BytesIO()
+            doc = SimpleDocTemplate(buffer, pagesize=A4)
             story = []
             
             # 获取样式
-            styles = self.getSampleStyleSheet()
-            
-            # 创建自定义样式
-            chinese_style = self.ParagraphStyle(
-                'ChineseStyle',
-                parent=styles['Normal'],
-                fontName='SimSun',
-                fontSize=12,
-                spaceAfter=12,
-                leading=14
-            )
-            
-            title_style = self.ParagraphStyle(
-                'TitleStyle',
-                parent=styles['Title'],
-                fontName='SimSun',
-                fontSize=18,
-                spaceAfter=20,
-                alignment=1  # 居中
-            )
+            chinese_style = self._chinese_style
+            title_style = self._title_style
             
             # 添加标题
             if 'metadata' in content and content['metadata'].get('title'):
                 title = content['metadata']['title']
-                story.append(self.Paragraph(title, title_style))
-                story.append(self.Spacer(1, 12))
+                story.append(Paragraph(title, title_style))
+                story.append(Spacer(1, 12))
             
             # 添加翻译提示
             if 'translated_language' in content:
-                notice_style = self.ParagraphStyle(
-                    'NoticeStyle',
-                    parent=styles['Normal'],
-                    fontName='SimSun',
-                    fontSize=10,
-                    textColor='gray',
-                    alignment=1  # 居中
-                )
                 notice = f"本文档已由系统自动翻译为 {content['translated_language'].upper()}"
-                story.append(self.Paragraph(notice, notice_style))
-                story.append(self.Spacer(1, 20))
+                story.append(Paragraph(notice, self._notice_style))
+                story.append(Spacer(1, 20))
             
-            # 添加主要内容
+            # 添加主要内容，热循环内使用局部绑定
+            append = story.append
+            make_paragraph = Paragraph
             if preserve_formatting and 'pages' in content:
                 # 保持页面格式
                 for page in content['pages']:
-                    if 'text' in page and page['text']:
-                        paragraphs = page['text'].split('\n\n')
-                        for para in paragraphs:
-                            if para.strip():
-                                story.append(self.Paragraph(para.strip(), chinese_style))
-                                story.append(self.Spacer(1, 6))
-                        story.append(self.PageBreak())
+                    page_text = page.get('text')
+                    if not page_text:
+                        continue
+                    page_start = len(story)
+                    for para in iter_paragraphs(page_text):
+                        append(make_paragraph(para, chinese_style))
+                    # 空白页不插入分页符
+                    if len(story) > page_start:
+                        append(PageBreak())
             else:
                 # 简单文本格式
                 text_content = content.get('text', '')
                 if text_content:
-                    paragraphs = text_content.split('\n\n')
-                    for para in paragraphs:
-                        if para.strip():
-                            story.append(self.Paragraph(para.strip(), chinese_style))
-                            story.append(self.Spacer(1, 6))
+                    for para in iter_paragraphs(text_content):
+                        append(make_paragraph(para, chinese_style))
+            
+            # 没有任何内容时输出一页空白页，保证生成的PDF可以正常打开
+            if not story:
+                story.append(Spacer(1, 1))
             
             # 生成PDF
             doc.build(story)
+            if output_stream is None:
+                with open(output_path, 'wb', buffering=1 << 20) as f:
+                    f.write(buffer.getbuffer())
             logger.info(f"PDF文档生成成功: {output_path}")
             return True
             
@@ -161,23 +317,9 @@ class DOCXGenerator(BaseGenerator):
     """DOCX文档生成器"""
     
     def __init__(self):
-        try:
-            from docx import Document
-            from docx.shared import Pt, Inches, RGBColor
-            from docx.enum.text import WD_ALIGN_PARAGRAPH
-            from docx.oxml.shared import OxmlElement, qn
-            
-            self.Document = Document
-            self.Pt = Pt
-            self.Inches = Inches
-            self.RGBColor = RGBColor
-            self.WD_ALIGN_PARAGRAPH = WD_ALIGN_PARAGRAPH
-            self.OxmlElement = OxmlElement
-            self.qn = qn
-            
-        except ImportError:
+        if Document is None:
             logger.error("python-docx库未安装，无法生成DOCX文件")
-            raise
+            raise ImportError("python-docx库未安装")
     
     def supports_format(self, format_type: str) -> bool:
         return format_type.lower() == 'docx'
@@ -185,66 +327,65 @@ class DOCXGenerator(BaseGenerator):
     def generate(self, content: Dict, output_path: str, original_path: str = None, preserve_formatting: bool = True) -> bool:
         """生成DOCX文档"""
         try:
-            doc = self.Document()
+            doc = Document()
             
             # 添加标题
             if 'metadata' in content and content['metadata'].get('title'):
                 title = doc.add_heading(content['metadata']['title'], 0)
-                title.alignment = self.WD_ALIGN_PARAGRAPH.CENTER
+                title.alignment = WD_ALIGN_PARAGRAPH.CENTER
             
             # 添加翻译提示
             if 'translated_language' in content:
                 notice_para = doc.add_paragraph()
                 notice_run = notice_para.add_run(f"本文档已由系统自动翻译为 {content['translated_language'].upper()}")
-                notice_run.font.color.rgb = self.RGBColor(128, 128, 128)
-                notice_run.font.size = self.Pt(10)
-                notice_para.alignment = self.WD_ALIGN_PARAGRAPH.CENTER
+                notice_run.font.color.rgb = RGBColor(128, 128, 128)
+                notice_run.font.size = Pt(10)
+                notice_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
                 doc.add_paragraph()  # 空行
             
             # 添加主要内容
             if preserve_formatting and 'paragraphs' in content:
                 # 保持段落格式
-                for para_info in content['paragraphs']:
-                    if 'text' in para_info and para_info['text']:
-                        para = doc.add_paragraph()
+                view = _to_content_view(content['paragraphs'])
+                texts, styles, alignments, all_runs = view
+                if len(texts) > _DOCX_FAST_PATH_THRESHOLD:
+                    # 大文档绕过 python-docx 的对象封装，直接构建 XML
+                    self._append_paragraphs_fast(doc, view)
+                else:
+                    for i in range(len(texts)):
+                        runs = all_runs[i]
+                        # 有运行信息时由运行逐段写入文本，段落只创建一次
+                        para_text = '' if runs is not None else texts[i]
                         
                         # 设置段落样式
-                        if 'style' in para_info:
-                            if 'Heading' in para_info['style']:
-                                level = 1 if '1' in para_info['style'] else 2
-                                para = doc.add_heading(para_info['text'], level)
-                            else:
-                                para = doc.add_paragraph(para_info['text'])
+                        level = _heading_level(styles[i])
+                        if level:
+                            para = doc.add_heading(para_text, level)
                         else:
-                            para = doc.add_paragraph(para_info['text'])
+                            para = doc.add_paragraph(para_text)
                         
                         # 设置对齐方式
-                        if 'alignment' in para_info:
-                            if para_info['alignment'] == 'CENTER':
-                                para.alignment = self.WD_ALIGN_PARAGRAPH.CENTER
-                            elif para_info['alignment'] == 'RIGHT':
-                                para.alignment = self.WD_ALIGN_PARAGRAPH.RIGHT
-                            else:
-                                para.alignment = self.WD_ALIGN_PARAGRAPH.LEFT
+                        alignment = alignments[i]
+                        if alignment is not None:
+                            para.alignment = _ALIGN_MAP.get(alignment, WD_ALIGN_PARAGRAPH.LEFT)
                         
                         # 设置运行属性
-                        if 'runs' in para_info and para_info['runs']:
-                            para.clear()
-                            for run_info in para_info['runs']:
-                                if 'text' in run_info and run_info['text']:
-                                    run = para.add_run(run_info['text'])
-                                    
-                                    # 设置字体样式
-                                    if run_info.get('bold'):
-                                        run.font.bold = True
-                                    if run_info.get('italic'):
-                                        run.font.italic = True
-                                    if run_info.get('underline'):
-                                        run.font.underline = True
-                                    
-                                    # 设置字体和大小
-                                    if run_info.get('font_size'):
-                                        run.font.size = self.Pt(run_info['font_size'])
+                        if runs:
+                            for run_text, bold, italic, underline, font_size in runs:
+                                run = para.add_run(run_text)
+                                font = run.font
+                                
+                                # 设置字体样式
+                                if bold:
+                                    font.bold = True
+                                if italic:
+                                    font.italic = True
+                                if underline:
+                                    font.underline = True
+                                
+                                # 设置字体和大小
+                                if font_size:
+                                    font.size = Pt(font_size)
             
             # 添加表格
             if 'tables' in content and content['tables']:
@@ -257,10 +398,11 @@ class DOCXGenerator(BaseGenerator):
                             table = doc.add_table(rows=rows, cols=cols)
                             table.style = 'Table Grid'
                             
-                            for i, row_data in enumerate(table_data):
-                                for j, cell_text in enumerate(row_data):
-                                    cell = table.cell(i, j)
-                                    cell.text = str(cell_text)
+                            # 直接在新建单元格的空段落中追加 w:r/w:t，
+                            # 避免 cell.text 每次清空并重建单元格内容
+                            for tr, row_data in zip(table._tbl.tr_lst, table_data):
+                                for tc, cell_text in zip(tr.tc_lst, row_data):
+                                    tc.p_lst[0].add_r().text = str(cell_text)
             
             # 保存文档
             doc.save(output_path)
@@ -271,6 +413,76 @@ class DOCXGenerator(BaseGenerator):
             logger.error(f"DOCX文档生成失败: {str(e)}")
             return False
 
+    def _append_paragraphs_fast(self, doc, view: ContentView):
+        """以 lxml 直接生成 w:p 元素并插入正文，输出与逐段调用 python-docx 一致"""
+        body = doc.element.body
+        sect_pr = body.find(qn('w:sectPr'))
+        insert = sect_pr.addprevious if sect_pr is not None else body.append
+        
+        Element = etree.Element
+        SubElement = etree.SubElement
+        tag_p, tag_ppr, tag_pstyle, tag_jc = qn('w:p'), qn('w:pPr'), qn('w:pStyle'), qn('w:jc')
+        tag_r, tag_rpr, tag_t = qn('w:r'), qn('w:rPr'), qn('w:t')
+        tag_b, tag_i, tag_sz, tag_u = qn('w:b'), qn('w:i'), qn('w:sz'), qn('w:u')
+        tag_br, tag_tab = qn('w:br'), qn('w:tab')
+        attr_val = qn('w:val')
+        attr_space = '{http://www.w3.org/XML/1998/namespace}space'
+        
+        # 标题样式ID只查询一次
+        heading_style_ids: Dict[int, str] = {}
+        
+        def append_text(r, text):
+            # 与 python-docx 一致：换行转为 w:br，制表符转为 w:tab
+            for line_no, line in enumerate(text.split('\n')):
+                if line_no:
+                    SubElement(r, tag_br)
+                for seg_no, seg in enumerate(line.split('\t')):
+                    if seg_no:
+                        SubElement(r, tag_tab)
+                    if seg:
+                        t = SubElement(r, tag_t)
+                        t.text = seg
+                        if seg[0].isspace() or seg[-1].isspace():
+                            t.set(attr_space, 'preserve')
+        
+        texts, styles, alignments, all_runs = view
+        for i in range(len(texts)):
+            p = Element(tag_p)
+            
+            # 段落属性：样式与对齐方式
+            level = _heading_level(styles[i])
+            alignment = alignments[i]
+            if level or alignment is not None:
+                ppr = SubElement(p, tag_ppr)
+                if level:
+                    style_id = heading_style_ids.get(level)
+                    if style_id is None:
+                        style_id = heading_style_ids[level] = doc.styles[f"Heading {level}"].style_id
+                    SubElement(ppr, tag_pstyle).set(attr_val, style_id)
+                if alignment is not None:
+                    SubElement(ppr, tag_jc).set(attr_val, _JC_VALUES.get(alignment, 'left'))
+            
+            runs = all_runs[i]
+            if runs is None:
+                append_text(SubElement(p, tag_r), texts[i])
+            else:
+                for run_text, bold, italic, underline, font_size in runs:
+                    r = SubElement(p, tag_r)
+                    if bold or italic or underline or font_size:
+                        # w:rPr 子元素需按架构顺序：b, i, sz, u
+                        rpr = SubElement(r, tag_rpr)
+                        if bold:
+                            SubElement(rpr, tag_b)
+                        if italic:
+                            SubElement(rpr, tag_i)
+                        if font_size:
+                            SubElement(rpr, tag_sz).set(attr_val, str(int(Pt(font_size).pt * 2)))
+                        if underline:
+                            SubElement(rpr, tag_u).set(attr_val, 'single')
+                    append_text(r, run_text)
+            
+            insert(p)
+
 class TXTGenerator(BaseGenerator):
     """TXT文档生成器"""
     
@@ -280,28 +492,35 @@ class TXTGenerator(BaseGenerator):
     def generate(self, content: Dict, output_path: str, original_path: str = None, preserve_formatting: bool = True) -> bool:
         """生成TXT文档"""
         try:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                # 添加标题
-                if 'metadata' in content and content['metadata'].get('title'):
-                    f.write(f"标题: {content['metadata']['title']}\n")
-                    f.write("=" * 50 + "\n\n")
-                
-                # 添加翻译提示
-                if 'translated_language' in content:
-                    f.write(f"[本文档已由系统自动翻译为 {content['translated_language'].upper()}]\n\n")
-                
-                # 添加主要内容
-                text_content = content.get('text', '')
-                if text_content:
-                    f.write(text_content)
-                
-                # 添加元数据信息
-                if 'metadata' in content:
-                    f.write("\n\n" + "=" * 50 + "\n")
-                    f.write("文档信息:\n")
-                    for key, value in content['metadata'].items():
-                        if key != 'title' and value:
-                            f.write(f"{key}: {value}\n")
+            # 先在内存中拼好全部内容，再一次性写入文件
+            parts: List[str] = []
+            
+            # 添加标题
+            if 'metadata' in content and content['metadata'].get('title'):
+                parts.append(f"标题: {content['metadata']['title']}\n")
+                parts.append("=" * 50 + "\n\n")
+            
+            # 添加翻译提示
+            if 'translated_language' in content:
+                parts.append(f"[本文档已由系统自动翻译为 {content['translated_language'].upper()}]\n\n")
+            
+            # 添加主要内容
+            text_content = content.get('text', '')
+            if text_content:
+                parts.append(text_content)
+            
+            # 添加元数据信息
+            if 'metadata' in content:
+                parts.append("\n\n" + "=" * 50 + "\n")
+                parts.append("文档信息:\n")
+                parts.extend(
+                    f"{key}: {value}\n"
+                    for key, value in content['metadata'].items()
+                    if key != 'title' and value
+                )
+            
+            with open(output_path, 'w', encoding='utf-8', buffering=1 << 16) as f:
+                f.write(''.join(parts))
             
             logger.info(f"TXT文档生成成功: {output_path}")
             return True
@@ -314,21 +533,9 @@ class PPTGenerator(BaseGenerator):
     """PPT/PPTX文档生成器"""
     
     def __init__(self):
-        try:
-            from pptx import Presentation
-            from pptx.util import Pt, Inches
-            from pptx.enum.text import PP_ALIGN
-            from pptx.dml.color import RGBColor
-            
-            self.Presentation = Presentation
-            self.Pt = Pt
-            self.Inches = Inches
-            self.PP_ALIGN = PP_ALIGN
-            self.RGBColor = RGBColor
-            
-        except ImportError:
+        if Presentation is None:
             logger.error("python-pptx库未安装，无法生成PPT文件")
-            raise
+            raise ImportError("python-pptx库未安装")
     
     def supports_format(self, format_type: str) -> bool:
         return format_type.lower() in ['.ppt', '.pptx']
@@ -336,11 +543,15 @@ class PPTGenerator(BaseGenerator):
     def generate(self, content: Dict, output_path: str, original_path: str = None, preserve_formatting: bool = True) -> bool:
         """生成PPT文档"""
         try:
-            prs = self.Presentation()
+            prs = Presentation()
             
-            # 添加标题页
+            # 版式只解析一次，循环内复用
             title_slide_layout = prs.slide_layouts[0]
-            slide = prs.slides.add_slide(title_slide_layout)
+            content_slide_layout = prs.slide_layouts[1]
+            add_slide = prs.slides.add_slide
+            
+            # 添加标题页
+            slide = add_slide(title_slide_layout)
             
             title = slide.shapes.title
             subtitle = slide.placeholders[1]
@@ -362,8 +573,7 @@ class PPTGenerator(BaseGenerator):
                 for slide_info in content['slides']:
                     if 'text' in slide_info and slide_info['text']:
                         # 创建内容幻灯片
-                        content_slide_layout = prs.slide_layouts[1]
-                        slide = prs.slides.add_slide(content_slide_layout)
+                        slide = add_slide(content_slide_layout)
                         
                         # 设置标题
                         title_shape = slide.shapes.title
@@ -375,8 +585,14 @@ class PPTGenerator(BaseGenerator):
                         # 设置内容
                         content_shape = slide.placeholders[1]
                         if 'content' in slide_info and slide_info['content']:
-                            content_text = '\n'.join(slide_info['content'])
-                            content_shape.text = content_text
+                            # 逐条写入段落，每个条目对应一个段落
+                            lines = slide_info['content']
+                            text_frame = content_shape.text_frame
+                            text_frame.clear()
+                            text_frame.paragraphs[0].text = lines[0]
+                            add_paragraph = text_frame.add_paragraph
+                            for line in lines[1:]:
+                                add_paragraph().text = line
                         
                         # 添加备注
                         if 'notes' in slide_info and slide_info['notes']:
@@ -386,18 +602,15 @@ class PPTGenerator(BaseGenerator):
                 # 如果没有幻灯片结构，直接添加文本内容
                 if 'text' in content and content['text']:
                     text_content = content['text']
-                    paragraphs = text_content.split('\n\n')
                     
-                    for para in paragraphs:
-                        if para.strip():
-                            content_slide_layout = prs.slide_layouts[1]
-                            slide = prs.slides.add_slide(content_slide_layout)
-                            
-                            title_shape = slide.shapes.title
-                            title_shape.text = "内容"
-                            
-                            content_shape = slide.placeholders[1]
-                            content_shape.text = para.strip()
+                    for para in iter_paragraphs(text_content):
+                        slide = add_slide(content_slide_layout)
+                        
+                        title_shape = slide.shapes.title
+                        title_shape.text = "内容"
+                        
+                        content_shape = slide.placeholders[1]
+                        content_shape.text = para
             
             # 保存演示文稿
             prs.save(output_path)
@@ -412,13 +625,27 @@ class DocumentGenerator:
     """文档生成器，支持多种格式"""
     
     def __init__(self):
-        self.generators = {
-            'pdf': PDFGenerator(),
-            'docx': DOCXGenerator(),
-            'txt': TXTGenerator(),
-            'ppt': PPTGenerator(),
-            'pptx': PPTGenerator()
+        # 生成器按需创建，只加载实际用到的文档库
+        self._generator_factories = {
+            'pdf': PDFGenerator,
+            'docx': DOCXGenerator,
+            'txt': TXTGenerator,
+            'ppt': PPTGenerator,
+            'pptx': PPTGenerator
         }
+        self._generators: Dict[str, BaseGenerator] = {}
+        
+        global _GC_FROZEN
+        if _AGGRESSIVE_GC and not _GC_FROZEN:
+            # 导入的文档库等长期存活对象移出分代回收，后续回收不再遍历
+            gc.freeze()
+            _GC_FROZEN = True
+    
+    def _get(self, key: str) -> BaseGenerator:
+        """获取指定格式的生成器，首次使用时创建"""
+        if key not in self._generators:
+            self._generators[key] = self._generator_factories[key]()
+        return self._generators[key]
     
     def generate(self, content: Dict, output_path: str, original_path: str = None, preserve_formatting: bool = True) -> bool:
         """
@@ -435,26 +662,33 @@ class DocumentGenerator:
         """
         try:
             # 根据输出文件扩展名选择生成器
-            output_ext = Path(output_path).suffix.lower()
-            
-            if output_ext == '.pdf':
-                generator = self.generators['pdf']
-            elif output_ext == '.docx':
-                generator = self.generators['docx']
-            elif output_ext == '.txt':
-                generator = self.generators['txt']
-            elif output_ext in ['.ppt', '.pptx']:
-                generator = self.generators['ppt']
-            else:
+            dot = output_path.rfind('.')
+            output_ext = output_path[dot:].lower() if dot != -1 else ''
+            
+            generator_key = _EXT_TO_KEY.get(output_ext)
+            if generator_key is None:
                 logger.error(f"不支持的输出格式: {output_ext}")
                 return False
             
+            # 空内容的 TXT 直接输出空文件，不加载文档库；
+            # PDF/DOCX/PPT 的空文件无法打开，仍由对应生成器输出有效的空白文档
+            if generator_key == 'txt' and _is_empty_content(content):
+                logger.warning(f"文档内容为空，跳过生成: {output_path}")
+                open(output_path, 'wb').close()
+                return True
+            
+            generator = self._get(generator_key)
+            
             # 生成文档
             return generator.generate(content, output_path, original_path, preserve_formatting)
             
         except Exception as e:
             logger.error(f"文档生成失败: {str(e)}")
             return False
+        finally:
+            if _AGGRESSIVE_GC:
+                # 每个文档会产生大量短生命周期对象，生成后立即完整回收
+                gc.collect(2)
     
     def get_supported_formats(self) -> List[str]:
         """获取支持的输出格式"""
@@ -3,43 +3,111 @@
 支持PDF、DOCX、DOC、TXT、PPT格式文件的文本提取
 """
 
+import atexit
 import os
 import re
+import threading
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import get_context
+from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 from loguru import logger
 
+from .utils import iter_paragraphs
+
+# PDF 多进程并行解析共用的进程池：使用 spawn 启动，避免在多线程服务进程中 fork；
+# 创建一次后长期复用，进程退出时关闭
+_PDF_POOL: Optional[ProcessPoolExecutor] = None
+_PDF_POOL_LOCK = threading.Lock()
+
+def _get_pdf_pool() -> ProcessPoolExecutor:
+    """获取PDF并行解析使用的进程池"""
+    global _PDF_POOL
+    with _PDF_POOL_LOCK:
+        if _PDF_POOL is None:
+            _PDF_POOL = ProcessPoolExecutor(max_workers=os.cpu_count() or 1, mp_context=get_context("spawn"))
+            atexit.register(_PDF_POOL.shutdown, wait=False, cancel_futures=True)
+        return _PDF_POOL
+
+# 文本清理使用的正则
+_RE_MULTI_NEWLINE = re.compile(r'\n{3,}')
+# 等价于 [ \t]+ 替换为单个空格，但跳过本来就是单个空格的位置
+_RE_SPACES = re.compile(r'(?: [ \t]|\t)[ \t]*')
+
+def _clean_text(text: str, collapse_spaces: bool = False) -> str:
+    """清理文本内容，移除多余的空行，collapse_spaces 为真时同时合并连续空格"""
+    text = _RE_MULTI_NEWLINE.sub('\n\n', text)
+    if collapse_spaces:
+        text = _RE_SPACES.sub(' ', text)
+    return text.strip()
+
+# 文本文件BOM及对应编码，UTF-32 需在 UTF-16 之前判断
+_TEXT_BOMS = (
+    (b'\xef\xbb\xbf', 'utf-8-sig'),
+    (b'\xff\xfe\x00\x00', 'utf-32'),
+    (b'\x00\x00\xfe\xff', 'utf-32'),
+    (b'\xff\xfe', 'utf-16'),
+    (b'\xfe\xff', 'utf-16')
+)
+
+def _prefetch_file(file_path: str):
+    """提示内核预读整个文件（仅支持 posix_fadvise 的平台），冷缓存时减少随机读等待"""
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    try:
+        fd = os.open(file_path, os.O_RDONLY)
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        finally:
+            os.close(fd)
+    except OSError:
+        pass
+
 class BaseParser(ABC):
     """基础解析器类"""
     
+    # 支持的文件扩展名（小写，带点）
+    extensions: Tuple[str, ...] = ()
+    
     @abstractmethod
     def parse(self, file_path: str) -> Optional[Dict]:
         """解析文件并返回结构化内容"""
         pass
     
-    @abstractmethod
     def supports_format(self, file_extension: str) -> bool:
         """检查是否支持该文件格式"""
-        pass
+        return file_extension.lower() in self.extensions
 
 class PDFParser(BaseParser):
     """PDF文件解析器"""
     
-    def __init__(self):
+    extensions = ('.pdf',)
+    
+    def __init__(self, block_details: bool = True, parallel_min_pages: Optional[int] = None):
+        """
+        Args:
+            block_details: 文本块是否包含逐 span 的字号信息；为 False 时使用
+                开销小得多的 "blocks" 元组提取，文本块字号统一为 12
+            parallel_min_pages: 页数达到该值时在进程池中分段并行解析；
+                默认 None 表示不启用（进程间传递页面结果的开销通常高于解析本身）
+        """
+        self.parallel_min_pages = parallel_min_pages
         try:
             import fitz  # PyMuPDF
             self.fitz = fitz
+            # 只需要文本块，关闭图片提取，避免在 dict 结果中复制图片二进制数据；
+            # 为 None 时按 "blocks" 方式提取
+            self._dict_flags = fitz.TEXTFLAGS_DICT & ~fitz.TEXT_PRESERVE_IMAGES if block_details else None
         except ImportError:
             logger.error("PyMuPDF库未安装，无法解析PDF文件")
             raise
     
-    def supports_format(self, file_extension: str) -> bool:
-        return file_extension.lower() == '.pdf'
-    
     def parse(self, file_path: str) -> Optional[Dict]:
         """解析PDF文件"""
         try:
+            # 页面加载是随机读取，提前触发整文件预读
+            _prefetch_file(file_path)
             doc = self.fitz.open(file_path)
             content = {
                 'text': '',
@@ -60,25 +128,25 @@ class PDFParser(BaseParser):
             }
             
             # 提取每页内容
-            for page_num in range(len(doc)):
-                page = doc.load_page(page_num)
-                page_text = page.get_text()
-                
-                # 提取页面信息
-                page_info = {
-                    'page_number': page_num + 1,
-                    'text': page_text,
-                    'rect': list(page.rect),
-                    'blocks': self._extract_blocks(page)
-                }
-                
-                content['pages'].append(page_info)
-                content['text'] += page_text + '\n\n'
+            page_count = len(doc)
+            if (self.parallel_min_pages is not None and page_count >= self.parallel_min_pages
+                    and (os.cpu_count() or 1) > 1):
+                page_results = self._parse_pages_parallel(file_path, page_count)
+            else:
+                page_results = None
+            if page_results is None:
+                page_results = [
+                    self._extract_page(doc.load_page(page_num), page_num, self._dict_flags)
+                    for page_num in range(page_count)
+                ]
+            
+            content['pages'] = [page_info for page_info, _ in page_results]
+            text_parts: List[str] = [page_text for _, page_text in page_results]
             
             doc.close()
             
             # 清理文本
-            content['text'] = self._clean_text(content['text'])
+            content['text'] = _clean_text('\n\n'.join(text_parts), collapse_spaces=True)
             
             return content
             
@@ -86,10 +154,58 @@ class PDFParser(BaseParser):
             logger.error(f"PDF解析失败: {str(e)}")
             return None
     
-    def _extract_blocks(self, page) -> List[Dict]:
+    def _parse_pages_parallel(self, file_path: str, page_count: int) -> Optional[List[Tuple[Dict, str]]]:
+        """将页面分段交给多个进程解析，失败时返回 None 由调用方顺序解析"""
+        try:
+            executor = _get_pdf_pool()
+            workers = min(os.cpu_count() or 1, page_count)
+            step = -(-page_count // workers)
+            futures = [
+                executor.submit(_parse_pdf_pages, file_path, start, min(start + step, page_count), self._dict_flags)
+                for start in range(0, page_count, step)
+            ]
+            page_results = []
+            for future in futures:
+                page_results.extend(future.result())
+            return page_results
+        except Exception as e:
+            logger.warning(f"PDF并行解析失败，改为顺序解析: {str(e)}")
+            return None
+    
+    @staticmethod
+    def _extract_page(page, page_num: int, dict_flags: Optional[int]) -> Tuple[Dict, str]:
+        """提取单页内容，返回页面信息和页面纯文本"""
+        if dict_flags is None:
+            # (x0, y0, x1, y1, text, block_no, block_type) 元组，块文本已按行拼好
+            text_blocks = [block for block in page.get_text("blocks") if block[6] == 0]
+            page_text = ''.join(block[4] for block in text_blocks)
+            block_info = [
+                {'type': 'text', 'text': block[4].strip(), 'bbox': block[:4], 'font_size': 12}
+                for block in text_blocks
+            ]
+        else:
+            # 只解析一次页面内容，纯文本由文本块中的 span 拼出
+            blocks = page.get_text("dict", flags=dict_flags)["blocks"]
+            page_text = ''.join(
+                ''.join(span["text"] for span in line["spans"]) + '\n'
+                for block in blocks if "lines" in block
+                for line in block["lines"]
+            )
+            block_info = PDFParser._extract_blocks(blocks)
+        
+        # 提取页面信息
+        page_info = {
+            'page_number': page_num + 1,
+            'text': page_text,
+            'rect': list(page.rect),
+            'blocks': block_info
+        }
+        return page_info, page_text
+    
+    @staticmethod
+    def _extract_blocks(blocks: List[Dict]) -> List[Dict]:
         """提取页面中的文本块"""
         try:
-            blocks = page.get_text("dict")["blocks"]
             block_info = []
             
             for block in blocks:
@@ -111,27 +227,33 @@ class PDFParser(BaseParser):
         except Exception as e:
             logger.warning(f"提取文本块失败: {str(e)}")
             return []
+
+def _parse_pdf_pages(file_path: str, start: int, stop: int, dict_flags: Optional[int]) -> List[Tuple[Dict, str]]:
+    """在工作进程中解析PDF第 start 到 stop-1 页"""
+    import fitz  # PyMuPDF
     
-    def _clean_text(self, text: str) -> str:
-        """清理文本内容"""
-        # 移除多余的空行和空格
-        text = re.sub(r'\n{3,}', '\n\n', text)
-        text = re.sub(r'[ \t]+', ' ', text)
-        return text.strip()
+    with fitz.open(file_path) as doc:
+        return [PDFParser._extract_page(doc.load_page(page_num), page_num, dict_flags) for page_num in range(start, stop)]
 
 class DOCXParser(BaseParser):
     """DOCX文件解析器"""
     
-    def __init__(self):
+    extensions = ('.docx',)
+    
+    def __init__(self, extract_tables: bool = True, extract_runs: bool = True):
+        """
+        Args:
+            extract_tables: 是否提取表格
+            extract_runs: 是否提取段落中的文本运行（格式信息）
+        """
         try:
             from docx import Document
             self.Document = Document
         except ImportError:
             logger.error("python-docx库未安装，无法解析DOCX文件")
             raise
-    
-    def supports_format(self, file_extension: str) -> bool:
-        return file_extension.lower() == '.docx'
+        self.extract_tables = extract_tables
+        self.extract_runs = extract_runs
     
     def parse(self, file_path: str) -> Optional[Dict]:
         """解析DOCX文件"""
@@ -146,37 +268,42 @@ class DOCXParser(BaseParser):
             }
             
             # 提取段落
+            text_parts: List[str] = []
             for para in doc.paragraphs:
                 para_text = para.text.strip()
                 if para_text:
                     para_info = {
                         'text': para_text,
                         'style': para.style.name if para.style else 'Normal',
-                        'alignment': str(para.alignment) if para.alignment else 'LEFT',
-                        'runs': self._extract_runs(para)
+                        'alignment': str(para.alignment) if para.alignment else 'LEFT'
                     }
+                    if self.extract_runs:
+                        para_info['runs'] = self._extract_runs(para)
                     content['paragraphs'].append(para_info)
-                    content['text'] += para_text + '\n\n'
+                    text_parts.append(para_text)
             
             # 提取表格
-            for table in doc.tables:
-                table_data = self._extract_table(table)
-                if table_data:
-                    content['tables'].append(table_data)
+            if self.extract_tables:
+                for table in doc.tables:
+                    table_data = self._extract_table(table)
+                    if table_data:
+                        content['tables'].append(table_data)
             
             # 提取文档属性
+            # 每个属性都需解析XML，只读取一次
             core_props = doc.core_properties
+            created = core_props.created
             content['metadata'] = {
                 'title': core_props.title or '',
                 'author': core_props.author or '',
                 'subject': core_props.subject or '',
-                'created': str(core_props.created) if core_props.created else '',
+                'created': str(created) if created else '',
                 'total_paragraphs': len(content['paragraphs']),
                 'total_tables': len(content['tables'])
             }
             
             # 清理文本
-            content['text'] = self._clean_text(content['text'])
+            content['text'] = _clean_text('\n\n'.join(text_parts))
             
             return content
             
@@ -188,15 +315,24 @@ class DOCXParser(BaseParser):
         """提取段落中的文本运行"""
         runs = []
         for run in paragraph.runs:
-            if run.text.strip():
-                runs.append({
-                    'text': run.text,
-                    'bold': run.bold,
-                    'italic': run.italic,
-                    'underline': run.underline,
-                    'font_name': run.font.name if run.font.name else 'Arial',
-                    'font_size': run.font.size.pt if run.font.size else 12
-                })
+            text = run.text
+            if not text.strip():
+                continue
+            # 字体属性均需解析XML，每个属性只读取一次
+            font = run.font
+            bold = font.bold
+            italic = font.italic
+            underline = font.underline
+            font_name = font.name
+            font_size = font.size
+            runs.append({
+                'text': text,
+                'bold': bold,
+                'italic': italic,
+                'underline': underline,
+                'font_name': font_name if font_name else 'Arial',
+                'font_size': font_size.pt if font_size else 12
+            })
         return runs
     
     def _extract_table(self, table) -> List[List[str]]:
@@ -209,15 +345,12 @@ class DOCXParser(BaseParser):
                 row_data.append(cell_text)
             table_data.append(row_data)
         return table_data
-    
-    def _clean_text(self, text: str) -> str:
-        """清理文本内容"""
-        text = re.sub(r'\n{3,}', '\n\n', text)
-        return text.strip()
 
 class DOCParser(BaseParser):
     """DOC文件解析器"""
     
+    extensions = ('.doc',)
+    
     def __init__(self):
         try:
             import win32com.client
@@ -225,15 +358,50 @@ class DOCParser(BaseParser):
         except ImportError:
             logger.warning("win32com库未安装，将使用antiword作为DOC文件解析备选方案")
             self.win32com = None
+        # Word 进程启动开销很大，首次使用时创建并在多个文件间复用，进程退出时关闭。
+        # COM 对象只能在创建它的线程中使用，而解析器实例会被不同的工具调用线程共用，
+        # 因此所有 Word 调用都交给一个已初始化 COM 的专用线程执行
+        self._word = None
+        self._com_executor: Optional[ThreadPoolExecutor] = None
+        if self.win32com:
+            import pythoncom
+            self._com_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix='word-com', initializer=pythoncom.CoInitialize
+            )
+            atexit.register(self._shutdown_com)
     
-    def supports_format(self, file_extension: str) -> bool:
-        return file_extension.lower() == '.doc'
+    def _shutdown_com(self):
+        """在COM线程中退出 Word 进程并关闭该线程"""
+        try:
+            self._com_executor.submit(self._quit_word).result(timeout=30)
+        except Exception as e:
+            logger.warning(f"退出Word失败: {str(e)}")
+        self._com_executor.shutdown(wait=False)
+    
+    def _get_word(self):
+        """获取复用的 Word.Application 实例（只在COM线程中调用）"""
+        if self._word is None:
+            word = self.win32com.Dispatch("Word.Application")
+            word.Visible = False
+            word.DisplayAlerts = 0
+            word.Options.SaveInterval = 0
+            self._word = word
+        return self._word
+    
+    def _quit_word(self):
+        """退出复用的 Word 进程（只在COM线程中调用）"""
+        word, self._word = self._word, None
+        if word is not None:
+            try:
+                word.Quit()
+            except Exception as e:
+                logger.warning(f"退出Word失败: {str(e)}")
     
     def parse(self, file_path: str) -> Optional[Dict]:
         """解析DOC文件"""
         try:
             if self.win32com:
-                return self._parse_with_win32com(file_path)
+                return self._com_executor.submit(self._parse_with_win32com, file_path).result()
             else:
                 return self._parse_with_antiword(file_path)
                 
@@ -243,11 +411,11 @@ class DOCParser(BaseParser):
     
     def _parse_with_win32com(self, file_path: str) -> Optional[Dict]:
         """使用win32com解析DOC文件"""
+        doc = None
         try:
-            word = self.win32com.Dispatch("Word.Application")
-            word.Visible = False
+            word = self._get_word()
             
-            doc = word.Documents.Open(file_path)
+            doc = word.Documents.Open(file_path, ReadOnly=True)
             content = {
                 'text': doc.Content.Text,
                 'paragraphs': [],
@@ -271,15 +439,21 @@ class DOCParser(BaseParser):
                 'total_paragraphs': len(content['paragraphs'])
             }
             
-            doc.Close()
-            word.Quit()
-            
-            content['text'] = self._clean_text(content['text'])
+            content['text'] = _clean_text(content['text'])
             return content
             
         except Exception as e:
             logger.error(f"win32com解析DOC失败: {str(e)}")
+            # Word 进程可能已失效，下次重新创建
+            if doc is None:
+                self._quit_word()
             return None
+        finally:
+            if doc is not None:
+                try:
+                    doc.Close(SaveChanges=False)
+                except Exception as e:
+                    logger.warning(f"关闭DOC文档失败: {str(e)}")
     
     def _parse_with_antiword(self, file_path: str) -> Optional[Dict]:
         """使用antiword解析DOC文件"""
@@ -298,12 +472,12 @@ class DOCParser(BaseParser):
                 text = result.stdout
                 content = {
                     'text': text,
-                    'paragraphs': [{'text': para.strip()} for para in text.split('\n\n') if para.strip()],
+                    'paragraphs': [{'text': para} for para in iter_paragraphs(text)],
                     'metadata': {'format': 'doc', 'parser': 'antiword'},
                     'format': 'doc'
                 }
                 
-                content['text'] = self._clean_text(content['text'])
+                content['text'] = _clean_text(content['text'])
                 return content
             else:
                 logger.error(f"antiword解析失败: {result.stderr}")
@@ -312,80 +486,92 @@ class DOCParser(BaseParser):
         except Exception as e:
             logger.error(f"antiword解析DOC失败: {str(e)}")
             return None
-    
-    def _clean_text(self, text: str) -> str:
-        """清理文本内容"""
-        text = re.sub(r'\n{3,}', '\n\n', text)
-        return text.strip()
 
 class TXTParser(BaseParser):
     """TXT文件解析器"""
     
-    def supports_format(self, file_extension: str) -> bool:
-        return file_extension.lower() == '.txt'
+    extensions = ('.txt',)
     
     def parse(self, file_path: str) -> Optional[Dict]:
         """解析TXT文件"""
         try:
+            # 只读取一次文件，编码检测和解码都在内存中完成
+            with open(file_path, 'rb') as f:
+                raw_data = f.read()
+            
             # 检测文件编码
-            encoding = self._detect_encoding(file_path)
+            encoding = self._detect_encoding(raw_data[:10000])
             
-            with open(file_path, 'r', encoding=encoding, errors='ignore') as f:
-                text_content = f.read()
+            text_content = raw_data.decode(encoding, errors='ignore')
+            # 与文本模式读取一致，统一换行符
+            if '\r' in text_content:
+                text_content = text_content.replace('\r\n', '\n').replace('\r', '\n')
             
             content = {
                 'text': text_content,
-                'paragraphs': [{'text': para.strip()} for para in text_content.split('\n\n') if para.strip()],
+                'paragraphs': [{'text': para} for para in iter_paragraphs(text_content)],
                 'metadata': {
                     'encoding': encoding,
-                    'line_count': len(text_content.split('\n')),
+                    'line_count': text_content.count('\n') + 1,
                     'char_count': len(text_content)
                 },
                 'format': 'txt'
             }
             
-            content['text'] = self._clean_text(content['text'])
+            content['text'] = _clean_text(content['text'])
             return content
             
         except Exception as e:
             logger.error(f"TXT解析失败: {str(e)}")
             return None
     
-    def _detect_encoding(self, file_path: str) -> str:
-        """检测文件编码"""
+    def _detect_encoding(self, raw_data: bytes) -> str:
+        """根据文件开头的采样字节（前10KB）检测文件编码"""
         try:
-            import chardet
+            # 带BOM的文件直接确定编码
+            for bom, encoding in _TEXT_BOMS:
+                if raw_data.startswith(bom):
+                    return encoding
             
-            with open(file_path, 'rb') as f:
-                raw_data = f.read(10000)  # 读取前10KB
+            # 绝大多数文本是UTF-8，能解码则无需调用编码检测库
+            try:
+                raw_data.decode('utf-8')
+                return 'utf-8'
+            except UnicodeDecodeError as e:
+                # 采样在多字节字符中间截断时，只有末尾不完整
+                if e.reason == 'unexpected end of data' and e.start >= len(raw_data) - 3:
+                    return 'utf-8'
+            
+            try:
+                from charset_normalizer import detect
+            except ImportError:
+                from chardet import detect
             
-            result = chardet.detect(raw_data)
+            result = detect(raw_data)
             encoding = result['encoding'] or 'utf-8'
             
-            # 验证编码
+            # 在内存中验证编码，不再重新打开文件
             try:
-                with open(file_path, 'r', encoding=encoding) as f:
-                    f.read(1000)
-                return encoding
-            except:
+                raw_data.decode(encoding)
+            except UnicodeDecodeError as e:
+                if e.start < len(raw_data) - 3:
+                    return 'utf-8'
+            except LookupError:
                 return 'utf-8'
+            return encoding
                 
         except ImportError:
-            logger.warning("chardet库未安装，使用默认UTF-8编码")
+            logger.warning("charset-normalizer和chardet库均未安装，使用默认UTF-8编码")
             return 'utf-8'
         except Exception as e:
             logger.error(f"编码检测失败: {str(e)}")
             return 'utf-8'
-    
-    def _clean_text(self, text: str) -> str:
-        """清理文本内容"""
-        # 移除多余的空行
-        text = re.sub(r'\n{3,}', '\n\n', text)
-        return text.strip()
 
 class PPTParser(BaseParser):
     """PPT/PPTX文件解析器"""
     
+    extensions = ('.ppt', '.pptx')
+    
     def __init__(self):
         try:
             from pptx import Presentation
@@ -394,9 +580,6 @@ class PPTParser(BaseParser):
             logger.error("python-pptx库未安装，无法解析PPT文件")
             raise
     
-    def supports_format(self, file_extension: str) -> bool:
-        return file_extension.lower() in ['.ppt', '.pptx']
-    
     def parse(self, file_path: str) -> Optional[Dict]:
         """解析PPT文件"""
         try:
@@ -409,8 +592,9 @@ class PPTParser(BaseParser):
             }
             
             # 提取每张幻灯片
-            for slide_idx, slide in enumerate(prs.slides):
-                slide_text = []
+            text_parts: List[str] = []
+            slides = prs.slides
+            for slide_idx, slide in enumerate(slides):
                 slide_info = {
                     'slide_number': slide_idx + 1,
                     'title': '',
@@ -418,20 +602,17 @@ class PPTParser(BaseParser):
                     'notes': ''
                 }
                 
-                # 提取标题
-                title_shape = None
+                # 一次遍历同时提取标题和内容
+                title_shape = slide.shapes.title
                 for shape in slide.shapes:
-                    if hasattr(shape, "text_frame") and shape.text_frame:
-                        if shape == slide.shapes.title:
-                            title_shape = shape
-                            slide_info['title'] = shape.text_frame.text
-                        else:
-                            slide_text.append(shape.text_frame.text)
-                
-                # 提取内容
-                for shape in slide.shapes:
-                    if hasattr(shape, "text_frame") and shape.text_frame and shape != title_shape:
-                        text = shape.text_frame.text.strip()
+                    if not getattr(shape, "has_text_frame", False):
+                        continue
+                    text = shape.text_frame.text
+                    # 形状代理对象每次重新创建，需用 == 按元素比较
+                    if title_shape is not None and shape == title_shape:
+                        slide_info['title'] = text
+                    else:
+                        text = text.strip()
                         if text:
                             slide_info['content'].append(text)
                 
@@ -446,7 +627,7 @@ class PPTParser(BaseParser):
                 # 合并所有文本
                 all_slide_text = slide_info['title'] + '\n' + '\n'.join(slide_info['content'])
                 if all_slide_text.strip():
-                    content['text'] += all_slide_text + '\n\n'
+                    text_parts.append(all_slide_text)
             
             # 提取文档属性
             core_props = prs.core_properties
@@ -454,54 +635,54 @@ class PPTParser(BaseParser):
                 'title': core_props.title or '',
                 'author': core_props.author or '',
                 'subject': core_props.subject or '',
-                'total_slides': len(prs.slides)
+                'total_slides': len(slides)
             }
             
-            content['text'] = self._clean_text(content['text'])
+            content['text'] = _clean_text('\n\n'.join(text_parts))
             return content
             
         except Exception as e:
             logger.error(f"PPT解析失败: {str(e)}")
             return None
-    
-    def _clean_text(self, text: str) -> str:
-        """清理文本内容"""
-        text = re.sub(r'\n{3,}', '\n\n', text)
-        return text.strip()
 
 # 解析器工厂
 class ParserFactory:
     """解析器工厂类"""
     
     def __init__(self):
-        self.parsers = [
-            PDFParser(),
-            DOCXParser(),
-            DOCParser(),
-            TXTParser(),
-            PPTParser()
-        ]
-    
-    def get_parser(self, file_extension: str) -> Optional[BaseParser]:
-        """根据文件扩展名获取合适的解析器"""
-        for parser in self.parsers:
-            if parser.supports_format(file_extension):
-                return parser
-        return None
-    
-    def get_supported_formats(self) -> List[str]:
-        """获取支持的文件格式列表"""
-        formats = []
-        for parser in self.parsers:
-            # 这里简化处理，实际需要根据每个解析器获取具体格式
-            if isinstance(parser, PDFParser):
-                formats.append('.pdf')
-            elif isinstance(parser, DOCXParser):
-                formats.append('.docx')
-            elif isinstance(parser, DOCParser):
-                formats.append('.doc')
-            elif isinstance(parser, TXTParser):
-                formats.append('.txt')
-            elif isinstance(parser, PPTParser):
-                formats.extend(['.ppt', '.pptx'])
-        return formats
\ No newline at end of file
+        # 解析器按需创建，只导入实际用到的解析库
+        self._parser_factories = {
+            ext: parser_class
+            for parser_class in (PDFParser, DOCXParser, DOCParser, TXTParser, PPTParser)
+            for ext in parser_class.extensions
+        }
+        # 解析器实例无状态，按解析器类和构造参数在进程内复用
+        self._instances: Dict[Tuple[type, Tuple], BaseParser] = {}
+        # 支持的格式固定不变，创建时计算一次
+        self._supported_formats: Tuple[str, ...] = tuple(self._parser_factories)
+    
+    def get_parser(self, file_extension: str, **options) -> Optional[BaseParser]:
+        """
+        根据文件扩展名获取合适的解析器
+        
+        Args:
+            file_extension: 文件扩展名（带点）
+            **options: 传给解析器构造函数的参数
+        """
+        parser_class = self._parser_factories.get(file_extension.lower())
+        if parser_class is None:
+            return None
+        
+        # 同一解析器类（如 .ppt/.pptx）在参数相同时共用一个实例
+        instance_key = (parser_class, tuple(sorted(options.items())))
+        parser = self._instances.get(instance_key)
+        if parser is None:
+            try:
+                parser = self._instances[instance_key] = parser_class(**options)
+            except ImportError:
+                return None
+        return parser
+    
+    def get_supported_formats(self) -> Tuple[str, ...]:
+        """获取支持的文件格式列表（只读元组）"""
+        return self._supported_formats
@@ -8,10 +8,19 @@ import time
 import hashlib
 import re
 import random
+import itertools
+import threading
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
 from loguru import logger
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .cache import create_translation_cache, make_cache_key
 
 try:
     from tencentcloud.common import credential
@@ -22,9 +31,48 @@ try:
 except ImportError:
     pass
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# 百度翻译请求的随机数：启动时随机取起点，之后递增，取值保持在 32768-65535
+_baidu_salt_counter = itertools.count(random.randint(32768, 65536))
+
+# HTTP 连接池默认大小，及网关类暂时性错误的重试策略
+_DEFAULT_POOL_MAXSIZE = 20
+_RETRY_STATUS_CODES = (502, 503, 504)
+
+def _create_session(pool_maxsize: int = _DEFAULT_POOL_MAXSIZE) -> requests.Session:
+    """
+    创建带连接池和重试的 HTTP 会话
+    
+    翻译接口多为只读查询，POST 同样允许重试；只重试连接失败和网关类状态码，
+    读取超时不重试，避免一次卡住的请求占用工作线程数倍的超时时间。
+    重试用尽后返回最后一次响应，由调用方按状态码处理（如百度翻译的 GET 回退）
+    """
+    session = requests.Session()
+    retry = Retry(
+        total=3,
+        connect=3,
+        read=0,
+        other=0,
+        backoff_factor=0.3,
+        status_forcelist=_RETRY_STATUS_CODES,
+        allowed_methods=None,
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=pool_maxsize, max_retries=retry)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
 class BaseTranslator(ABC):
     """基础翻译器类"""
     
+    # 单次批量请求的文本 UTF-8 字节数上限（含分隔符），None 表示只按字符数分批
+    max_batch_bytes: Optional[int] = None
+    
     @abstractmethod
     def translate(self, text: str, source_language: str, target_language: str) -> str:
         """翻译文本"""
@@ -34,12 +82,17 @@ class BaseTranslator(ABC):
     def get_supported_languages(self) -> List[str]:
         """获取支持的语言列表"""
         pass
+    
+    def translate_batch(self, texts: List[str], source_language: str, target_language: str) -> List[str]:
+        """批量翻译文本，结果与输入顺序一致；默认逐条调用 translate"""
+        return [self.translate(text, source_language, target_language) for text in texts]
 
 class GoogleTranslator(BaseTranslator):
     """Google翻译API"""
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, session: Optional[requests.Session] = None):
         self.api_key = api_key
+        self.session = session or _create_session()
         self.base_url = "https://translation.googleapis.com/language/translate/v2"
         self.language_map = {
             'zh': 'zh-CN',
@@ -75,10 +128,10 @@ class GoogleTranslator(BaseTranslator):
                 'format': 'text'
             }
             
-            response = requests.post(self.base_url, params=params, timeout=30)
+            response = self.session.post(self.base_url, params=params, timeout=30)
             response.raise_for_status()
             
-            result = response.json()
+            result = orjson.loads(response.content)
             
             if 'data' in result and 'translations' in result['data']:
                 return result['data']['translations'][0]['translatedText']
@@ -90,6 +143,39 @@ class GoogleTranslator(BaseTranslator):
             logger.error(f"Google翻译失败: {str(e)}")
             return self._fallback_translate(text, source_language, target_language)
     
+    def translate_batch(self, texts: List[str], source_language: str, target_language: str) -> List[str]:
+        """批量翻译：多个 q 参数在一次请求中提交"""
+        if not self.api_key or len(texts) <= 1:
+            return super().translate_batch(texts, source_language, target_language)
+        
+        try:
+            target_lang = self.language_map.get(target_language, target_language)
+            source_lang = self.language_map.get(source_language, source_language)
+            
+            # 文本放在请求体中，避免URL过长
+            data = [('q', text) for text in texts]
+            data += [
+                ('target', target_lang),
+                ('source', source_lang if source_language != 'auto' else ''),
+                ('format', 'text')
+            ]
+            
+            response = self.session.post(self.base_url, params={'key': self.api_key}, data=data, timeout=30)
+            response.raise_for_status()
+            
+            result = orjson.loads(response.content)
+            
+            translations = result.get('data', {}).get('translations')
+            if translations and len(translations) == len(texts):
+                return [item['translatedText'] for item in translations]
+            logger.error(f"Google翻译API返回错误: {result}")
+                
+        except Exception as e:
+            logger.error(f"Google批量翻译失败: {str(e)}")
+        
+        logger.warning("使用备用翻译方法，返回原文")
+        return list(texts)
+    
     def _fallback_translate(self, text: str, source_language: str, target_language: str) -> str:
         """备用翻译方法"""
         # 这里可以实现简单的翻译逻辑或返回原文
@@ -99,16 +185,27 @@ class GoogleTranslator(BaseTranslator):
 class BaiduTranslator(BaseTranslator):
     """百度翻译API (支持通用翻译 doc/21 和 领域翻译 doc/22)"""
     
-    def __init__(self, app_id: Optional[str] = None, app_key: Optional[str] = None, domain: Optional[str] = None):
+    # 百度翻译的 q 参数建议不超过 6000 字节，按行拼接的批量请求需控制在此以内
+    max_batch_bytes = 6000
+    
+    def __init__(self, app_id: Optional[str] = None, app_key: Optional[str] = None, domain: Optional[str] = None,
+                 session: Optional[requests.Session] = None):
         self.app_id = str(app_id).strip() if app_id else None
         self.app_key = str(app_key).strip() if app_key else None
         self.domain = str(domain).strip() if domain else None
+        self.session = session or _create_session()
         
         # 根据是否有 domain 参数决定使用通用翻译还是领域翻译
         if self.domain:
             self.base_url = "https://fanyi-api.baidu.com/api/trans/vip/fieldtranslate"
         else:
             self.base_url = "https://fanyi-api.baidu.com/api/trans/vip/translate"
+        
+        # 签名的固定部分预先计算：appid 前缀的摘要状态每次请求 copy() 复用，salt 之后的后缀只编码一次
+        # 领域翻译签名: appid+q+salt+domain+key；通用翻译签名: appid+q+salt+key
+        if self.app_id and self.app_key:
+            self._sign_prefix = hashlib.md5(self.app_id.encode('utf-8'))
+            self._sign_suffix = f"{self.domain or ''}{self.app_key}".encode('utf-8')
             
         self.language_map = {
             'zh': 'zh',
@@ -130,27 +227,55 @@ class BaiduTranslator(BaseTranslator):
             logger.warning("百度翻译API密钥未配置")
             return self._fallback_translate(text, source_language, target_language)
         
+        translated_lines = self._request_lines(text, source_language, target_language)
+        if translated_lines is None:
+            return self._fallback_translate(text, source_language, target_language)
+        # 合并多个翻译结果
+        return '\n'.join(translated_lines)
+    
+    def translate_batch(self, texts: List[str], source_language: str, target_language: str) -> List[str]:
+        """批量翻译：单行文本以换行拼接后一次请求，API 按行返回翻译结果"""
+        if not self.app_id or not self.app_key:
+            return super().translate_batch(texts, source_language, target_language)
+        
+        results: List[Optional[str]] = [None] * len(texts)
+        single_line = [idx for idx, text in enumerate(texts) if '\n' not in text and '\r' not in text]
+        if len(single_line) > 1:
+            query = '\n'.join(texts[idx] for idx in single_line)
+            translated_lines = self._request_lines(query, source_language, target_language)
+            if translated_lines is not None and len(translated_lines) == len(single_line):
+                for idx, line in zip(single_line, translated_lines):
+                    results[idx] = line
+            elif translated_lines is not None:
+                logger.warning("百度翻译返回行数与请求不一致，改为逐条翻译")
+        
+        # 多行文本及批量失败的文本逐条翻译
+        for idx, text in enumerate(texts):
+            if results[idx] is None:
+                results[idx] = self.translate(text, source_language, target_language)
+        return results
+    
+    def _request_lines(self, text: str, source_language: str, target_language: str) -> Optional[List[str]]:
+        """请求百度翻译API，返回逐行翻译结果，失败时返回 None"""
         try:
             # 映射语言代码
             target_lang = self.language_map.get(target_language, target_language)
             source_lang = self.language_map.get(source_language, source_language)
             
             # 生成随机数
-            salt = str(random.randint(32768, 65536))
+            salt = str(next(_baidu_salt_counter) & 0xFFFF | 0x8000)
             
-            # 生成签名
-            if self.domain:
-                # 领域翻译签名: appid+q+salt+domain+key
-                sign_str = f"{self.app_id}{text}{salt}{self.domain}{self.app_key}"
-            else:
-                # 通用翻译签名: appid+q+salt+key
-                sign_str = f"{self.app_id}{text}{salt}{self.app_key}"
-                
-            sign = hashlib.md5(sign_str.encode('utf-8')).hexdigest()
+            # 生成签名（文本只编码一次，从预先计算的 appid 摘要状态继续增量计算）
+            text_bytes = text.encode('utf-8')
+            sign_hash = self._sign_prefix.copy()
+            sign_hash.update(text_bytes)
+            sign_hash.update(salt.encode('ascii'))
+            sign_hash.update(self._sign_suffix)
+            sign = sign_hash.hexdigest()
             
-            # 构建请求参数
+            # 构建请求参数（请求体直接使用已编码的文本）
             params = {
-                'q': text,
+                'q': text_bytes,
                 'from': source_lang if source_language != 'auto' else 'auto',
                 'to': target_lang,
                 'appid': self.app_id,
@@ -166,23 +291,19 @@ class BaiduTranslator(BaseTranslator):
             }
             
             # 优先使用 POST 请求以支持较长文本
-            response = requests.post(self.base_url, data=params, headers=headers, timeout=30)
+            response = self.session.post(self.base_url, data=params, headers=headers, timeout=30)
             
             # 如果 POST 失败且状态码不是 200，尝试 GET
             if response.status_code != 200:
                 logger.warning(f"百度翻译POST请求失败(status={response.status_code})，尝试GET请求")
-                response = requests.get(self.base_url, params=params, timeout=30)
+                response = self.session.get(self.base_url, params=params, timeout=30)
             
             response.raise_for_status()
             
-            result = response.json()
+            result = orjson.loads(response.content)
             
             if 'trans_result' in result:
-                # 合并多个翻译结果
-                translated_parts = []
-                for trans in result['trans_result']:
-                    translated_parts.append(trans['dst'])
-                return '\n'.join(translated_parts)
+                return [trans['dst'] for trans in result['trans_result']]
             else:
                 logger.error(f"百度翻译API返回错误: {result}")
                 if result.get('error_code') == '54001':
@@ -194,11 +315,11 @@ class BaiduTranslator(BaseTranslator):
                         debug_sign_str = f"{self.app_id}{text[:10]}...{salt}{masked_key}"
                     logger.error(f"签名错误调试: appid={self.app_id}, salt={salt}, sign={sign}, debug_str={debug_sign_str}")
                     logger.error(f"请检查: 1. AppID/Key是否正确 2. 是否开通了对应服务(通用vs领域) 3. 领域参数是否匹配")
-                return self._fallback_translate(text, source_language, target_language)
+                return None
                 
         except Exception as e:
             logger.error(f"百度翻译失败: {str(e)}")
-            return self._fallback_translate(text, source_language, target_language)
+            return None
     
     def _fallback_translate(self, text: str, source_language: str, target_language: str) -> str:
         """备用翻译方法"""
@@ -208,9 +329,11 @@ class BaiduTranslator(BaseTranslator):
 class YoudaoTranslator(BaseTranslator):
     """有道翻译API"""
     
-    def __init__(self, app_id: Optional[str] = None, app_secret: Optional[str] = None):
+    def __init__(self, app_id: Optional[str] = None, app_secret: Optional[str] = None,
+                 session: Optional[requests.Session] = None):
         self.app_id = app_id
         self.app_secret = app_secret
+        self.session = session or _create_session()
         self.base_url = "https://openapi.youdao.com/api"
         self.language_map = {
             'zh': 'zh-CHS',
@@ -238,16 +361,20 @@ class YoudaoTranslator(BaseTranslator):
             source_lang = self.language_map.get(source_language, source_language)
             
             # 生成随机数
-            salt = str(int(time.time() * 1000))
+            now = time.time()
+            salt = str(int(now * 1000))
             
             # 生成签名
-            curtime = str(int(time.time()))
-            sign_str = f"{self.app_id}{text}{salt}{curtime}{self.app_secret}"
-            sign = hashlib.sha256(sign_str.encode('utf-8')).hexdigest()
+            curtime = str(int(now))
+            text_bytes = text.encode('utf-8')
+            sign_hash = hashlib.sha256(f"{self.app_id}".encode('utf-8'))
+            sign_hash.update(text_bytes)
+            sign_hash.update(f"{salt}{curtime}{self.app_secret}".encode('utf-8'))
+            sign = sign_hash.hexdigest()
             
-            # 构建请求参数
+            # 构建请求参数（请求体直接使用已编码的文本）
             params = {
-                'q': text,
+                'q': text_bytes,
                 'from': source_lang if source_language != 'auto' else 'auto',
                 'to': target_lang,
                 'appKey': self.app_id,
@@ -257,10 +384,10 @@ class YoudaoTranslator(BaseTranslator):
                 'curtime': curtime
             }
             
-            response = requests.post(self.base_url, data=params, timeout=30)
+            response = self.session.post(self.base_url, data=params, timeout=30)
             response.raise_for_status()
             
-            result = response.json()
+            result = orjson.loads(response.content)
             
             if 'translation' in result:
                 return result['translation'][0]
@@ -319,19 +446,85 @@ class TencentTranslator(BaseTranslator):
         logger.warning("使用备用翻译方法，返回原文")
         return text
 
+# 语言检测：依次判断的语言、删除其余字符的正则、码位范围、字符占比阈值
+# 删除非目标字符后取剩余长度即为目标字符数，比 findall 构建匹配列表更快
+_LANGUAGE_PATTERNS = (
+    ('zh', re.compile(r'[^\u4e00-\u9fff]+'), ((0x4e00, 0x9fff),), 0.3),
+    ('ja', re.compile(r'[^\u3040-\u309f\u30a0-\u30ff]+'), ((0x3040, 0x309f), (0x30a0, 0x30ff)), 0.1),
+    ('ko', re.compile(r'[^\uac00-\ud7af]+'), ((0xac00, 0xd7af),), 0.1),
+    ('ru', re.compile(r'[^\u0400-\u04ff]+'), ((0x0400, 0x04ff),), 0.1)
+)
+
+# 文本长度达到该值且安装了 numpy 时，按码位数组向量化统计；
+# 短文本转换数组的固定开销高于正则，仍使用正则
+_NUMPY_MIN_CHARS = 1000
+
+# 语言检测只统计文本开头的这些字符，足以判断书写系统
+_DETECT_SAMPLE_SIZE = 2048
+
+# 翻译结果缓存的默认容量（条目数）
+_DEFAULT_CACHE_SIZE = 4096
+
+# 批量翻译时单次请求的默认上限
+_DEFAULT_BATCH_MAX_CHARS = 5000
+_DEFAULT_BATCH_MAX_ITEMS = 50
+
+# 同时进行的翻译请求数默认上限
+_DEFAULT_MAX_CONCURRENCY = 8
+
+def _iter_batches(indices: List[int], texts: List[str], max_chars: int, max_items: int,
+                  max_bytes: Optional[int] = None) -> Iterator[List[int]]:
+    """按字符数、条目数和可选的 UTF-8 字节数上限将待翻译文本的下标分批"""
+    batch: List[int] = []
+    batch_chars = 0
+    batch_bytes = 0
+    for idx in indices:
+        text_len = len(texts[idx])
+        # 字节数按换行拼接后的请求长度计算，每条文本多一个分隔符
+        text_bytes = len(texts[idx].encode('utf-8')) + 1 if max_bytes is not None else 0
+        if batch and (batch_chars + text_len > max_chars or len(batch) >= max_items
+                      or (max_bytes is not None and batch_bytes + text_bytes > max_bytes)):
+            yield batch
+            batch = []
+            batch_chars = 0
+            batch_bytes = 0
+        batch.append(idx)
+        batch_chars += text_len
+        batch_bytes += text_bytes
+    if batch:
+        yield batch
+
 class TranslationEngine:
     """翻译引擎，整合多个翻译服务"""
     
-    def __init__(self, config: Optional[Dict] = None):
+    def __init__(self, config: Optional[Dict] = None, session: Optional[requests.Session] = None):
         self.config = config or {}
+        # 所有翻译器共享同一个 HTTP 会话，跨请求复用 TCP/TLS 连接
+        self._owns_session = session is None
+        # 连接池不小于并发请求数，避免并发批次之间争抢连接
+        max_concurrency = int(self.config.get('max_concurrency', _DEFAULT_MAX_CONCURRENCY))
+        self.session = session or _create_session(max(_DEFAULT_POOL_MAXSIZE, max_concurrency))
         self.translators = []
+        # 相同文本和语言对只请求一次翻译API，按最近使用淘汰
+        self._cache: OrderedDict = OrderedDict()
+        self._cache_size = int(self.config.get('translation_cache_size', _DEFAULT_CACHE_SIZE))
+        self._cache_lock = threading.Lock()
+        # 可选的持久化缓存（SQLite/Redis），进程重启后仍可命中
+        self._persistent_cache = create_translation_cache(self.config)
+        self._batch_max_chars = int(self.config.get('batch_max_chars', _DEFAULT_BATCH_MAX_CHARS))
+        self._batch_max_items = int(self.config.get('batch_max_items', _DEFAULT_BATCH_MAX_ITEMS))
+        # 多个批次的请求并发发出，线程池按需创建
+        self._max_concurrency = max_concurrency
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self._supported_languages: Optional[Tuple[str, ...]] = None
         self._initialize_translators()
     
     def _initialize_translators(self):
         """初始化翻译器"""
         # Google翻译
         if self.config.get('google_api_key'):
-            self.translators.append(GoogleTranslator(self.config['google_api_key']))
+            self.translators.append(GoogleTranslator(self.config['google_api_key'], session=self.session))
         
         # 百度翻译
         if self.config.get('baidu_app_id') and self.config.get('baidu_app_key'):
@@ -339,7 +532,8 @@ class TranslationEngine:
                 BaiduTranslator(
                     self.config['baidu_app_id'],
                     self.config['baidu_app_key'],
-                    self.config.get('baidu_domain')  # 支持配置领域
+                    self.config.get('baidu_domain'),  # 支持配置领域
+                    session=self.session
                 )
             )
         
@@ -348,7 +542,8 @@ class TranslationEngine:
             self.translators.append(
                 YoudaoTranslator(
                     self.config['youdao_app_id'],
-                    self.config['youdao_app_secret']
+                    self.config['youdao_app_secret'],
+                    session=self.session
                 )
             )
         
@@ -363,7 +558,7 @@ class TranslationEngine:
         
         # 如果没有配置任何API，添加默认的Google翻译（无API密钥）
         if not self.translators:
-            self.translators.append(GoogleTranslator())
+            self.translators.append(GoogleTranslator(session=self.session))
             logger.warning("未配置翻译API，使用基础翻译功能")
     
     def translate(self, text: str, source_language: str = 'auto', target_language: str = 'zh') -> str:
@@ -385,12 +580,18 @@ class TranslationEngine:
         if source_language == target_language:
             return text
         
+        cache_key = make_cache_key(text, source_language, target_language)
+        cached = self._lookup_cached([cache_key])[0]
+        if cached is not None:
+            return cached
+        
         # 尝试使用每个翻译器
         for translator in self.translators:
             try:
                 result = translator.translate(text, source_language, target_language)
                 if result and result != text:
                     logger.info(f"翻译成功：{translator.__class__.__name__}")
+                    self._store_results([(cache_key, result)])
                     return result
             except Exception as e:
                 logger.warning(f"{translator.__class__.__name__} 翻译失败: {str(e)}")
@@ -400,8 +601,156 @@ class TranslationEngine:
         logger.error("所有翻译器都失败，返回原文")
         return text
     
-    def get_supported_languages(self) -> List[str]:
-        """获取支持的语言列表"""
+    def translate_batch(self, texts: List[str], source_language: str = 'auto', target_language: str = 'zh') -> List[str]:
+        """
+        批量翻译文本
+        
+        未命中缓存的文本按字符数和条目数分批，每批一次API请求；
+        某个翻译器未能翻译的文本交给下一个翻译器继续尝试。
+        
+        Args:
+            texts: 要翻译的文本列表
+            source_language: 源语言代码，默认为auto（自动检测）
+            target_language: 目标语言代码，默认为zh（中文）
+        
+        Returns:
+            与 texts 顺序一致的翻译结果，翻译失败的文本保留原文
+        """
+        results = list(texts)
+        if source_language == target_language:
+            return results
+        
+        # 重复的文本（页眉、页脚、固定表述等）只翻译一次，再按原顺序展开
+        unique_texts = list(dict.fromkeys(texts))
+        if len(unique_texts) < len(texts):
+            translated = dict(zip(unique_texts, self.translate_batch(unique_texts, source_language, target_language)))
+            return [translated[text] for text in texts]
+        
+        candidates = [idx for idx, text in enumerate(texts) if text and text.strip()]
+        cache_keys = {idx: make_cache_key(texts[idx], source_language, target_language) for idx in candidates}
+        
+        pending: List[int] = []
+        for idx, cached in zip(candidates, self._lookup_cached([cache_keys[idx] for idx in candidates])):
+            if cached is not None:
+                results[idx] = cached
+            else:
+                pending.append(idx)
+        
+        new_results: List[Tuple[str, str]] = []
+        
+        # 依次尝试每个翻译器
+        for translator in self.translators:
+            if not pending:
+                break
+            remaining: List[int] = []
+            batches = list(_iter_batches(
+                pending, texts, self._batch_max_chars, self._batch_max_items, translator.max_batch_bytes
+            ))
+            
+            def translate_one(batch: List[int]) -> List[Optional[str]]:
+                try:
+                    return translator.translate_batch([texts[idx] for idx in batch], source_language, target_language)
+                except Exception as e:
+                    logger.warning(f"{translator.__class__.__name__} 批量翻译失败: {str(e)}")
+                    return [None] * len(batch)
+            
+            # 网络请求为主，多个批次并发请求，整体耗时接近最慢的一次请求
+            if len(batches) > 1 and self._max_concurrency > 1:
+                translated_batches = self._get_executor().map(translate_one, batches)
+            else:
+                translated_batches = map(translate_one, batches)
+            
+            for batch, translated in zip(batches, translated_batches):
+                for idx, result in zip(batch, translated):
+                    if result and result != texts[idx]:
+                        results[idx] = result
+                        new_results.append((cache_keys[idx], result))
+                    else:
+                        remaining.append(idx)
+            
+            if len(remaining) < len(pending):
+                logger.info(f"翻译成功：{translator.__class__.__name__}，{len(pending) - len(remaining)} 条")
+            pending = remaining
+        
+        if new_results:
+            self._store_results(new_results)
+        
+        if pending:
+            # 所有翻译器都失败的文本保留原文
+            logger.error(f"所有翻译器都失败，{len(pending)} 条文本返回原文")
+        return results
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """获取并发请求使用的线程池"""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self._max_concurrency)
+            return self._executor
+    
+    def _lookup_cached(self, cache_keys: List[str]) -> List[Optional[str]]:
+        """先查内存缓存，未命中的再查持久化缓存，结果与 cache_keys 顺序一致"""
+        values: List[Optional[str]] = []
+        with self._cache_lock:
+            for cache_key in cache_keys:
+                cached = self._cache.get(cache_key)
+                if cached is not None:
+                    self._cache.move_to_end(cache_key)
+                values.append(cached)
+        
+        if self._persistent_cache is None:
+            return values
+        
+        missing = [idx for idx, value in enumerate(values) if value is None]
+        if missing:
+            try:
+                stored = self._persistent_cache.get_many([cache_keys[idx] for idx in missing])
+            except Exception as e:
+                logger.warning(f"读取翻译缓存失败: {str(e)}")
+                return values
+            hits = []
+            for idx, value in zip(missing, stored):
+                if value is not None:
+                    values[idx] = value
+                    hits.append((cache_keys[idx], value))
+            self._remember(hits)
+        return values
+    
+    def _store_results(self, items: List[Tuple[str, str]]):
+        """缓存成功的翻译结果"""
+        self._remember(items)
+        if self._persistent_cache is not None:
+            try:
+                self._persistent_cache.set_many(items)
+            except Exception as e:
+                logger.warning(f"写入翻译缓存失败: {str(e)}")
+    
+    def _remember(self, items: List[Tuple[str, str]]):
+        """写入内存缓存，超出容量时淘汰最久未使用的条目"""
+        if self._cache_size <= 0 or not items:
+            return
+        with self._cache_lock:
+            for cache_key, result in items:
+                self._cache[cache_key] = result
+                self._cache.move_to_end(cache_key)
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+    
+    def close(self):
+        """关闭翻译引擎创建的 HTTP 会话和并发线程池"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        if self._persistent_cache is not None:
+            self._persistent_cache.close()
+            self._persistent_cache = None
+        if self._owns_session:
+            self.session.close()
+    
+    def get_supported_languages(self) -> Tuple[str, ...]:
+        """获取支持的语言列表（只读元组，首次调用时汇总各翻译器后缓存）"""
+        if self._supported_languages is not None:
+            return self._supported_languages
+        
         languages = set()
         for translator in self.translators:
             try:
@@ -411,7 +760,8 @@ class TranslationEngine:
                 logger.warning(f"获取{translator.__class__.__name__}支持语言失败: {str(e)}")
                 continue
         
-        return sorted(list(languages))
+        self._supported_languages = tuple(sorted(languages))
+        return self._supported_languages
     
     def detect_language(self, text: str) -> str:
         """
@@ -429,25 +779,20 @@ class TranslationEngine:
         if not text or not text.strip():
             return 'unknown'
         
-        # 中文字符检测
-        chinese_chars = len(re.findall(r'[\u4e00-\u9fff]', text))
-        if chinese_chars > len(text) * 0.3:
-            return 'zh'
-        
-        # 日文检测
-        japanese_chars = len(re.findall(r'[\u3040-\u309f\u30a0-\u30ff]', text))
-        if japanese_chars > len(text) * 0.1:
-            return 'ja'
-        
-        # 韩文检测
-        korean_chars = len(re.findall(r'[\uac00-\ud7af]', text))
-        if korean_chars > len(text) * 0.1:
-            return 'ko'
-        
-        # 俄文检测
-        russian_chars = len(re.findall(r'[\u0400-\u04ff]', text))
-        if russian_chars > len(text) * 0.1:
-            return 'ru'
+        # 依次检测中文、日文、韩文、俄文字符在开头样本中的占比，命中即返回
+        sample = text[:_DETECT_SAMPLE_SIZE]
+        text_len = len(sample)
+        code_points = None
+        if np is not None and text_len >= _NUMPY_MIN_CHARS:
+            code_points = np.frombuffer(sample.encode('utf-32-le', 'surrogatepass'), dtype='<u4')
+        
+        for language, other_chars_re, ranges, ratio in _LANGUAGE_PATTERNS:
+            if code_points is not None:
+                count = sum(int(((code_points >= low) & (code_points <= high)).sum()) for low, high in ranges)
+            else:
+                count = len(other_chars_re.sub('', sample))
+            if count > text_len * ratio:
+                return language
         
         # 默认返回英文
         return 'en'
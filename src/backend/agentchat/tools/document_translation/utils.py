@@ -4,31 +4,39 @@
 """
 
 import os
-import re
 import time
 import mimetypes
-from typing import Dict, List, Optional, Any
+from collections import deque
+from typing import Dict, Iterator, List, Optional, Tuple, Any
 from pathlib import Path
 from loguru import logger
 
+# 进度跟踪器保留的最近消息条数
+_MAX_PROGRESS_MESSAGES = 100
+
 class ProgressTracker:
     """进度跟踪器"""
     
     def __init__(self, total_steps: int = 100):
         self.total_steps = total_steps
         self.current_step = 0
-        self.start_time = time.time()
-        self.messages = []
+        # 使用单调时钟计时，不受系统时间调整影响
+        self.start_time = time.monotonic()
+        # 只保留最近的消息，长任务的内存占用不随步数增长
+        self.messages = deque(maxlen=_MAX_PROGRESS_MESSAGES)
+        self.total_messages = 0
         
     def update(self, message: str, steps: int = 1):
-        """更新进度"""
+        """更新进度，steps 可一次推进多步"""
         self.current_step += steps
+        self.total_messages += 1
         self.messages.append({
-            'time': time.time(),
+            'time': time.monotonic(),
             'message': message,
-            'progress': min(100, (self.current_step / self.total_steps) * 100)
+            'progress': self.get_progress_percentage()
         })
-        logger.info(f"[{self.get_progress_percentage():.1f}%] {message}")
+        # 日志级别未启用时不计算格式化参数
+        logger.opt(lazy=True).info("[{:.1f}%] {}", self.get_progress_percentage, lambda: message)
     
     def get_progress_percentage(self) -> float:
         """获取进度百分比"""
@@ -36,14 +44,14 @@ class ProgressTracker:
     
     def get_elapsed_time(self) -> float:
         """获取已用时间"""
-        return time.time() - self.start_time
+        return time.monotonic() - self.start_time
     
     def get_estimated_time_remaining(self) -> float:
         """获取预计剩余时间"""
-        if self.current_step == 0:
+        elapsed = self.get_elapsed_time()
+        if self.current_step == 0 or elapsed <= 0:
             return 0
         
-        elapsed = self.get_elapsed_time()
         rate = self.current_step / elapsed
         remaining_steps = self.total_steps - self.current_step
         
@@ -58,7 +66,7 @@ class ProgressTracker:
             'current_step': self.current_step,
             'total_steps': self.total_steps,
             'latest_message': self.messages[-1]['message'] if self.messages else '',
-            'total_messages': len(self.messages)
+            'total_messages': self.total_messages
         }
 
 def validate_file_size(file_path: str, max_size_mb: int = 50) -> bool:
@@ -114,6 +122,11 @@ def get_file_mime_type(file_path: str) -> str:
         logger.error(f"获取MIME类型失败: {str(e)}")
         return 'application/octet-stream'
 
+# 文件名中的不合法字符替换为下划线，控制字符直接删除
+_FILENAME_TRANSLATION = dict.fromkeys(map(ord, '<>:"/\\|?*'), '_')
+_FILENAME_TRANSLATION.update(dict.fromkeys(range(0x20)))
+_FILENAME_TRANSLATION.update(dict.fromkeys(range(0x7f, 0xa0)))
+
 def sanitize_filename(filename: str) -> str:
     """
     清理文件名，移除不合法字符
@@ -124,12 +137,8 @@ def sanitize_filename(filename: str) -> str:
     Returns:
         清理后的文件名
     """
-    # 移除或替换不合法字符
-    invalid_chars = r'[<>:"/\\|?*]'
-    filename = re.sub(invalid_chars, '_', filename)
-    
-    # 移除控制字符
-    filename = re.sub(r'[\x00-\x1f\x7f-\x9f]', '', filename)
+    # 替换不合法字符并移除控制字符，一次 translate 完成
+    filename = filename.translate(_FILENAME_TRANSLATION)
     
     # 限制长度
     max_length = 255
@@ -172,15 +181,20 @@ def cleanup_temp_files(file_paths: List[str]) -> bool:
     
     for file_path in file_paths:
         try:
-            if os.path.exists(file_path):
-                os.remove(file_path)
-                success_count += 1
-                logger.debug(f"清理文件成功: {file_path}")
+            # 直接删除，不存在时忽略，省去一次 exists 检查
+            os.remove(file_path)
+            success_count += 1
+            logger.debug(f"清理文件成功: {file_path}")
+        except FileNotFoundError:
+            pass
         except Exception as e:
             logger.warning(f"清理文件失败 {file_path}: {str(e)}")
     
     return success_count == len(file_paths)
 
+# 文件大小单位，依次相差 1024 倍
+_SIZE_UNITS = ("B", "KB", "MB", "GB", "TB")
+
 def format_file_size(size_bytes: int) -> str:
     """
     格式化文件大小
@@ -194,14 +208,12 @@ def format_file_size(size_bytes: int) -> str:
     if size_bytes == 0:
         return "0 B"
     
-    size_names = ["B", "KB", "MB", "GB", "TB"]
+    # 由二进制位数直接得到单位级别（每 10 位一级），除以 2 的幂结果与逐级除以 1024 相同
     i = 0
+    if size_bytes >= 1024:
+        i = min((int(size_bytes).bit_length() - 1) // 10, len(_SIZE_UNITS) - 1)
     
-    while size_bytes >= 1024 and i < len(size_names) - 1:
-        size_bytes /= 1024.0
-        i += 1
-    
-    return f"{size_bytes:.1f} {size_names[i]}"
+    return f"{size_bytes / (1 << (10 * i)):.1f} {_SIZE_UNITS[i]}"
 
 def estimate_translation_time(text_length: int, complexity: str = 'normal') -> float:
     """
@@ -236,10 +248,22 @@ def estimate_translation_time(text_length: int, complexity: str = 'normal') -> f
     
     return max(1.0, total_time)  # 最少1秒
 
+# 长文本分块时优先切分的句末标点，其次为分句标点
+_SENTENCE_ENDINGS = ('.', '!', '?', '。', '！', '？')
+_CLAUSE_SEPARATORS = (',', ';', '，', '；')
+
+def _last_boundary(text: str, separators: Tuple[str, ...], start: int, end: int) -> int:
+    """返回 text[start:end] 中最后一个分隔符之后的位置，没有分隔符时返回 -1"""
+    pos = max(text.rfind(separator, start, end) for separator in separators)
+    return pos + 1 if pos >= 0 else -1
+
 def split_text_for_translation(text: str, max_chunk_size: int = 5000) -> List[str]:
     """
     将长文本分割成适合翻译的块
     
+    每块为原文的连续片段（保留原有标点），优先在句末切分，
+    单句超长时在逗号、分号处切分，仍超长时按长度切分。
+    
     Args:
         text: 原始文本
         max_chunk_size: 最大块大小（字符数）
@@ -251,53 +275,44 @@ def split_text_for_translation(text: str, max_chunk_size: int = 5000) -> List[st
         return [text]
     
     chunks = []
-    current_chunk = ""
+    text_len = len(text)
+    start = 0
     
-    # 按句子分割
-    sentences = re.split(r'[.!?。！？]\s*', text)
-    
-    for sentence in sentences:
-        sentence = sentence.strip()
-        if not sentence:
-            continue
-        
-        # 添加标点符号
-        if sentence:
-            sentence += ". "
-        
-        # 检查当前块大小
-        if len(current_chunk) + len(sentence) <= max_chunk_size:
-            current_chunk += sentence
+    while start < text_len:
+        end = start + max_chunk_size
+        if end >= text_len:
+            cut = text_len
         else:
-            # 保存当前块
-            if current_chunk:
-                chunks.append(current_chunk.strip())
-            
-            # 开始新块
-            if len(sentence) <= max_chunk_size:
-                current_chunk = sentence
-            else:
-                # 如果单个句子就超过限制，按标点分割
-                sub_sentences = re.split(r'[,;，；]\s*', sentence)
-                sub_chunk = ""
-                for sub_sentence in sub_sentences:
-                    if len(sub_chunk) + len(sub_sentence) <= max_chunk_size:
-                        sub_chunk += sub_sentence + ", "
-                    else:
-                        if sub_chunk:
-                            chunks.append(sub_chunk.strip())
-                        sub_chunk = sub_sentence + ", "
-                
-                if sub_chunk:
-                    chunks.append(sub_chunk.strip())
-                current_chunk = ""
-    
-    # 添加最后一个块
-    if current_chunk:
-        chunks.append(current_chunk.strip())
+            # 在当前窗口内从后向前查找切分点
+            cut = _last_boundary(text, _SENTENCE_ENDINGS, start, end)
+            if cut <= start:
+                cut = _last_boundary(text, _CLAUSE_SEPARATORS, start, end)
+            if cut <= start:
+                cut = end
+        
+        chunk = text[start:cut].strip()
+        if chunk:
+            chunks.append(chunk)
+        start = cut
     
     return chunks
 
+def iter_paragraphs(text: str) -> Iterator[str]:
+    """按空行逐个产出去除首尾空白后的非空段落，不构建中间列表"""
+    find = text.find
+    start = 0
+    while True:
+        idx = find('\n\n', start)
+        if idx == -1:
+            chunk = text[start:].strip()
+            if chunk:
+                yield chunk
+            return
+        chunk = text[start:idx].strip()
+        if chunk:
+            yield chunk
+        start = idx + 2
+
 def create_progress_tracker(total_steps: int = 100) -> ProgressTracker:
     """
     创建进度跟踪器
@@ -1,5 +1,7 @@
+import hashlib
 import requests
 from loguru import logger
+from concurrent.futures import ThreadPoolExecutor
 from http import HTTPStatus
 from urllib.parse import urlparse, unquote
 from pathlib import PurePosixPath
@@ -9,6 +11,14 @@ from langchain.tools import tool
 
 from agentchat.settings import app_settings
 from agentchat.services.aliyun_oss import aliyun_oss
+from agentchat.services.redis import redis_client
+
+# 图片从生成服务流式转存到OSS时每次读取的字节数
+_STREAM_CHUNK_SIZE = 64 * 1024
+# 同时下载并上传的图片数上限
+_MAX_UPLOAD_WORKERS = 4
+# 相同提示词的生成结果在Redis中缓存的时间（秒）
+_RESULT_CACHE_EXPIRATION = 7 * 86400
 
 
 @tool(parse_docstring=True)
@@ -25,8 +35,57 @@ def text_to_image(user_prompt: str):
     return _text_to_image(user_prompt)
 
 
+def _upload_result_image(result):
+    """下载一张生成的图片并转存到OSS，返回 (图片链接, 错误信息)"""
+    try:
+        # 解析文件名
+        url_path = urlparse(result.url).path
+        unquoted_path = unquote(url_path)
+        file_name = PurePosixPath(unquoted_path).parts[-1]
+
+        # 可选：添加存储前缀，方便管理OSS文件
+        oss_object_name = f"text_to_image/{file_name}"  # 例如存到images目录下
+
+        # 流式获取图片并直接上传到OSS，不在内存中缓存完整图片
+        with requests.get(result.url, stream=True, timeout=30) as response:
+            if response.status_code == 200:
+                # 以分块迭代器上传，OSS SDK 对长度未知的数据使用分块传输编码
+                upload_result = aliyun_oss.upload_file(oss_object_name, response.iter_content(chunk_size=_STREAM_CHUNK_SIZE))
+                # 上传失败（包括流式读取中断）时 upload_file 只记录日志，需根据返回结果判断
+                if upload_result is None or upload_result.status != 200:
+                    return None, f"图片 {file_name} 上传到OSS失败"
+                logger.info(f"图片 {file_name} 已成功上传到OSS")
+
+                # 构建图片显示信息
+                return f"{app_settings.aliyun_oss["base_url"]}/{oss_object_name}", None
+            else:
+                logger.error(
+                    f"获取图片 {result.url} 失败，状态码: {response.status_code}")
+                return None, f"获取图片 {result.url} 失败，状态码: {response.status_code}"
+
+    except Exception as e:
+        logger.error(f"处理图片 {result.url} 时出错: {str(e)}")
+        return None, f"处理图片 {result.url} 时出错: {str(e)}"
+
+
+def _result_cache_key(user_prompt):
+    """按模型和提示词生成缓存键，切换模型后不会命中旧结果"""
+    model_name = app_settings.multi_models.text2image.model_name
+    digest = hashlib.sha256(f"{model_name}\n{user_prompt}".encode('utf-8')).hexdigest()
+    return f"text_to_image:{digest}"
+
+
 def _text_to_image(user_prompt):
     """根据用户的图片描述生成一张照片，返回Markdown图片语法供直接显示"""
+    # 相同提示词已生成过图片时直接返回OSS上的结果，不再重复调用生成服务
+    cache_key = _result_cache_key(user_prompt)
+    try:
+        if cached := redis_client.get(cache_key):
+            logger.info(f"命中图片生成缓存: {cache_key}")
+            return cached
+    except Exception as e:
+        logger.warning(f"读取图片生成缓存失败: {str(e)}")
+
     rsp = ImageSynthesis.call(api_key=app_settings.multi_models.text2image.api_key,
                               model=app_settings.multi_models.text2image.model_name,
                               prompt=user_prompt,
@@ -34,41 +93,36 @@ def _text_to_image(user_prompt):
                               size='1024*1024')
     if rsp.status_code == HTTPStatus.OK:
         # 上传图片到OSS
-        for result in rsp.output.results:
-            try:
-                # 解析文件名
-                url_path = urlparse(result.url).path
-                unquoted_path = unquote(url_path)
-                file_name = PurePosixPath(unquoted_path).parts[-1]
-
-                # 可选：添加存储前缀，方便管理OSS文件
-                oss_object_name = f"text_to_image/{file_name}"  # 例如存到images目录下
+        results = rsp.output.results
+        if len(results) <= 1:
+            # 当前每次只生成一张图片，直接在当前线程中下载并上传，不创建线程池
+            outcomes = [_upload_result_image(result) for result in results]
+        else:
+            # 多张图片的下载和上传互不依赖，并发执行
+            with ThreadPoolExecutor(max_workers=min(len(results), _MAX_UPLOAD_WORKERS)) as executor:
+                outcomes = list(executor.map(_upload_result_image, results))
 
-                # 直接获取图片内容并上传到OSS
-                response = requests.get(result.url)
-                if response.status_code == 200:
-                    aliyun_oss.upload_file(oss_object_name, response.content)
-                    logger.info(f"图片 {file_name} 已成功上传到OSS")
+        image_urls = [image_url for image_url, _ in outcomes if image_url]
+        if not image_urls:
+            # 全部失败时返回第一条错误信息
+            return next((error for _, error in outcomes if error), None)
 
-                    # 构建图片显示信息
-                    image_url = f"{app_settings.aliyun_oss["base_url"]}/{oss_object_name}"
-
-                    # 构建返回内容 - 添加描述文字和图片
-                    content = f"""
+        # 构建返回内容 - 添加描述文字和图片，按生成顺序排列
+        images = "\n\n".join(f"![{user_prompt}]({image_url})" for image_url in image_urls)
+        content = f"""
 🖼️ 生成的图片如下：
 
-![{user_prompt}]({image_url})
+{images}
 """.strip()
 
-                    # 返回字符串内容，让wrap_tool_call处理成ToolMessage
-                    return content
-                else:
-                    logger.error(
-                        f"获取图片 {result.url} 失败，状态码: {response.status_code}")
-                    return f"获取图片 {result.url} 失败，状态码: {response.status_code}"
-
+        # 只缓存全部图片都已确认上传成功的结果，避免后续相同提示词拿到失效链接
+        if len(image_urls) == len(outcomes):
+            try:
+                redis_client.set(key=cache_key, value=content, expiration=_RESULT_CACHE_EXPIRATION)
             except Exception as e:
-                logger.error(f"处理图片 {result.url} 时出错: {str(e)}")
-                return f"处理图片 {result.url} 时出错: {str(e)}"
+                logger.warning(f"写入图片生成缓存失败: {str(e)}")
+
+        # 返回字符串内容，让wrap_tool_call处理成ToolMessage
+        return content
     else:
         return 'sync_call Failed, status_code: %s, code: %s, message: %s' % (rsp.status_code, rsp.code, rsp.message)
@@ -1,66 +1,180 @@
+import io
 import os
-import json
-from typing import Optional, Any
+import time
+import atexit
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Any, Tuple
+from loguru import logger
 from langchain.tools import tool
 
 from agentchat.settings import app_settings
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-def _refresh_metaso_client(api_key: str) -> None:
-    import httpx
-    from metaso_sdk import client as client_module
+# metaso_sdk 首次使用时导入，之后复用模块引用
+_CLIENT_MOD = None
+_SEARCH_MOD = None
+# 构造 Query 的函数：pydantic v2 模型使用 model_construct 跳过校验，否则直接实例化
+_QUERY_FACTORY = None
+
+# 最近一次安装到 metaso_sdk 的 (api_key, client)，密钥未变时直接跳过刷新
+_INSTALLED: Tuple[Optional[str], Optional[object]] = (None, None)
+# 并发调用时串行化客户端的检查与安装，已安装时的快速路径不加锁
+_CLIENT_LOCK = threading.Lock()
+
+# 进程内共用的 httpx 客户端，更换密钥时只修改请求头，保留已建立的连接
+_HTTPX_CLIENT = None
+
+# 批量搜索时同时进行的请求数上限
+_MAX_BATCH_WORKERS = 8
+
+# 非流式搜索结果的短期缓存，智能体短时间内重复提出相同问题时不再请求接口
+_SEARCH_CACHE_SIZE = 256
+_SEARCH_CACHE_TTL = 60
+_SEARCH_CACHE: "OrderedDict[Tuple[str, Optional[str]], Tuple[float, str]]" = OrderedDict()
+_SEARCH_CACHE_LOCK = threading.Lock()
+
+# 解析出的 API Key 在进程内复用，鉴权失败时清除后重新读取配置
+_API_KEY_CACHE: Optional[str] = None
+
+
+def _load_metaso_sdk() -> None:
+    global _CLIENT_MOD, _SEARCH_MOD, _QUERY_FACTORY
+    if _SEARCH_MOD is not None:
+        return
     import importlib
+    from metaso_sdk import Query
+    from metaso_sdk import client as client_module
+
+    _CLIENT_MOD = client_module
+    _QUERY_FACTORY = getattr(Query, "model_construct", Query)
+    _SEARCH_MOD = importlib.import_module("metaso_sdk.search")
+
+
+def _get_httpx_client():
+    global _HTTPX_CLIENT
+    if _HTTPX_CLIENT is None:
+        import httpx
+
+        _HTTPX_CLIENT = httpx.Client(
+            base_url="https://metaso.cn/api/open",
+            timeout=60,
+            limits=httpx.Limits(max_keepalive_connections=20),
+        )
+        atexit.register(_HTTPX_CLIENT.close)
+    return _HTTPX_CLIENT
+
+
+def _refresh_metaso_client(api_key: str) -> None:
+    if _INSTALLED[0] is api_key and _INSTALLED[1] is not None:
+        return
+    with _CLIENT_LOCK:
+        _install_metaso_client(api_key)
+
+
+def _install_metaso_client(api_key: str) -> None:
+    global _INSTALLED
+    if _INSTALLED[0] is api_key and _INSTALLED[1] is not None:
+        return
+
+    _load_metaso_sdk()
+    client_module = _CLIENT_MOD
 
     current_key = getattr(client_module, "api_key", None)
-    if current_key == api_key and getattr(client_module, "client", None) is not None:
+    current_client = getattr(client_module, "client", None)
+    if current_key == api_key and current_client is not None:
+        _INSTALLED = (api_key, current_client)
         return
 
-    existing_client = getattr(client_module, "client", None)
-    if existing_client is not None:
+    client = _get_httpx_client()
+    if current_client is not None and current_client is not client:
         try:
-            existing_client.close()
+            current_client.close()
         except Exception:
             pass
 
-    client = httpx.Client(
-        base_url="https://metaso.cn/api/open",
-        headers={"Authorization": f"Bearer {api_key}"},
-        timeout=60,
-    )
+    client.headers["Authorization"] = f"Bearer {api_key}"
     client_module.api_key = api_key
     client_module.client = client
-    search_module = importlib.import_module("metaso_sdk.search")
-    search_module.client = client
+    _SEARCH_MOD.client = client
+    _INSTALLED = (api_key, client)
+
+
+def _invalidate_api_key_cache() -> None:
+    global _API_KEY_CACHE
+    _API_KEY_CACHE = None
 
 
 def _get_metaso_api_key() -> Optional[str]:
-    tool_config = getattr(app_settings.tools, "metaso", {})
+    global _API_KEY_CACHE
+    if _API_KEY_CACHE is None:
+        _API_KEY_CACHE = _resolve_metaso_api_key()
+    return _API_KEY_CACHE
+
+
+def _resolve_metaso_api_key() -> Optional[str]:
+    # 环境变量优先，只有在其未设置时才读取配置
+    env_key = (os.environ.get("METASO_API_KEY") or "").strip()
+    if env_key:
+        return env_key
+
+    tool_config = getattr(app_settings.tools, "metaso", None) or {}
     if isinstance(tool_config, dict):
         api_key = tool_config.get("api_key")
     else:
         api_key = getattr(tool_config, "api_key", None)
-    env_key = os.environ.get("METASO_API_KEY")
-    if env_key and env_key.strip():
-        return env_key.strip()
-    if api_key and str(api_key).strip():
-        os.environ["METASO_API_KEY"] = str(api_key).strip()
-        return os.environ.get("METASO_API_KEY")
-    return None
+    return str(api_key or "").strip() or None
+
+
+def _normalize_dict(value: dict) -> str:
+    for key in _RESPONSE_TEXT_KEYS:
+        text = value.get(key)
+        if isinstance(text, str):
+            return text
+    if orjson is not None:
+        try:
+            # orjson 直接输出 UTF-8，无需 ensure_ascii
+            return orjson.dumps(value).decode("utf-8")
+        except TypeError:
+            # 非字符串键、超出 64 位的整数等 orjson 不支持的内容退回标准库
+            pass
+    import json
+
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _normalize_list(value: list) -> str:
+    return "\n\n".join(filter(None, map(_normalize_response, value)))
+
+
+# 响应中依次尝试读取的文本字段
+_RESPONSE_TEXT_KEYS = ("text", "answer", "content", "data")
+
+# 按响应类型分派的转换函数
+_NORMALIZERS = {
+    type(None): lambda value: "",
+    str: lambda value: value,
+    dict: _normalize_dict,
+    list: _normalize_list,
+}
 
 
 def _normalize_response(value: Any) -> str:
-    if value is None:
-        return ""
+    normalizer = _NORMALIZERS.get(type(value))
+    if normalizer is not None:
+        return normalizer(value)
+    # 子类型按原有顺序匹配
     if isinstance(value, str):
         return value
     if isinstance(value, dict):
-        for key in ["text", "answer", "content", "data"]:
-            if key in value and isinstance(value[key], str):
-                return value[key]
-        return json.dumps(value, ensure_ascii=False)
+        return _normalize_dict(value)
     if isinstance(value, list):
-        parts = [_normalize_response(item) for item in value]
-        return "\n\n".join([part for part in parts if part])
+        return _normalize_list(value)
     return str(value)
 
 
@@ -84,28 +198,150 @@ def metaso_search(query: str, session_id: Optional[str] = None, stream: Optional
         raise ValueError("METASO_API_KEY 未配置，请在配置文件 tools.metaso.api_key 中设置")
 
     _refresh_metaso_client(api_key)
-    from metaso_sdk import Query
-    import importlib
-    search_module = importlib.import_module("metaso_sdk.search")
+    try:
+        return _run_metaso_search(query, session_id, stream, max_chars)
+    except Exception as e:
+        if getattr(getattr(e, "response", None), "status_code", None) == 401:
+            _invalidate_api_key_cache()
+        raise
+
 
-    query_payload = {"question": query}
+@tool("metaso_search_batch", parse_docstring=True)
+def metaso_search_batch(queries: List[str], max_chars: Optional[int] = None):
+    """
+    使用 MetaSo 搜索引擎同时搜索多个问题，需要对多个子问题分别联网搜索时一次调用即可
+
+    Args:
+        queries: 需要搜索的问题列表
+        max_chars: 每个问题最大返回字符数，避免输出过长
+
+    Returns:
+        按问题顺序返回各自联网搜索到的信息
+    """
+    if not queries:
+        return ""
+    api_key = _get_metaso_api_key()
+    if not api_key:
+        raise ValueError("METASO_API_KEY 未配置，请在配置文件 tools.metaso.api_key 中设置")
+
+    _refresh_metaso_client(api_key)
+
+    def search_one(query: str) -> str:
+        try:
+            return _run_metaso_search(query, None, False, max_chars)
+        except Exception as e:
+            if getattr(getattr(e, "response", None), "status_code", None) == 401:
+                _invalidate_api_key_cache()
+            return f"搜索失败: {str(e)}"
+
+    # 各请求共用同一个 httpx 客户端的连接池并发发出
+    unique_queries = list(dict.fromkeys(queries))
+    with ThreadPoolExecutor(max_workers=min(_MAX_BATCH_WORKERS, len(unique_queries))) as executor:
+        results = dict(zip(unique_queries, executor.map(search_one, unique_queries)))
+
+    return "\n\n".join(f"【{query}】\n{results[query]}" for query in queries)
+
+
+def _get_cached_search(key: Tuple[str, Optional[str]]) -> Optional[str]:
+    with _SEARCH_CACHE_LOCK:
+        entry = _SEARCH_CACHE.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del _SEARCH_CACHE[key]
+            return None
+        _SEARCH_CACHE.move_to_end(key)
+        return entry[1]
+
+
+def _put_cached_search(key: Tuple[str, Optional[str]], result: str) -> None:
+    with _SEARCH_CACHE_LOCK:
+        _SEARCH_CACHE[key] = (time.monotonic() + _SEARCH_CACHE_TTL, result)
+        _SEARCH_CACHE.move_to_end(key)
+        if len(_SEARCH_CACHE) > _SEARCH_CACHE_SIZE:
+            _SEARCH_CACHE.popitem(last=False)
+
+
+def clear_search_cache() -> None:
+    with _SEARCH_CACHE_LOCK:
+        _SEARCH_CACHE.clear()
+
+
+def _run_metaso_search(query: str, session_id: Optional[str], stream: Optional[bool],
+                       max_chars: Optional[int]) -> str:
+    search_module = _SEARCH_MOD
+    # 参数来自工具签名，类型已确定
     if session_id:
-        query_payload["sessionId"] = session_id
+        search_query = _QUERY_FACTORY(question=query, sessionId=session_id)
+    else:
+        search_query = _QUERY_FACTORY(question=query)
 
     if stream:
-        chunks = []
-        for chunk in search_module.search(Query(**query_payload), stream=True):
-            if isinstance(chunk, dict):
-                if chunk.get("type") == "append-text" and chunk.get("text"):
-                    chunks.append(chunk.get("text"))
-                elif chunk.get("text"):
-                    chunks.append(chunk.get("text"))
-            elif isinstance(chunk, str):
-                chunks.append(chunk)
-        result = "".join(chunks)
+        buf = io.StringIO()
+        write = buf.write
+        total = 0
+        # 负数上限按切片语义从末尾截取，需要完整结果
+        limit = max_chars if max_chars is not None and max_chars >= 0 else None
+        chunks = search_module.search(search_query, stream=True)
+        try:
+            for chunk in chunks:
+                if isinstance(chunk, dict):
+                    # append-text 与其他带文本的分片处理方式相同，只需取一次 text
+                    text = chunk.get("text")
+                elif isinstance(chunk, str):
+                    text = chunk
+                else:
+                    continue
+                if text:
+                    write(text)
+                    total += len(text)
+                    # 已达到返回上限，不再继续接收后续分片
+                    if limit is not None and total >= limit:
+                        break
+        finally:
+            # 提前结束时关闭生成器，释放底层的流式连接
+            close = getattr(chunks, "close", None)
+            if close is not None:
+                close()
+        if limit is not None:
+            # 在缓冲区内截断，只生成返回所需长度的字符串
+            buf.truncate(limit)
+        result = buf.getvalue()
     else:
-        result = _normalize_response(search_module.search(Query(**query_payload)))
+        # 缓存完整结果，不同的 max_chars 共用同一条缓存
+        cache_key = (query, session_id or None)
+        result = _get_cached_search(cache_key)
+        if result is None:
+            result = _normalize_response(search_module.search(search_query))
+            if result:
+                _put_cached_search(cache_key, result)
 
     if max_chars is not None and isinstance(result, str):
         return result[:max_chars]
     return result
+
+
+def _prewarm_metaso_client() -> None:
+    # 提前安装客户端并建立 TLS 连接，首次搜索不再承担握手耗时
+    try:
+        api_key = _get_metaso_api_key()
+        if not api_key:
+            return
+        _refresh_metaso_client(api_key)
+        # 通过实际安装到 metaso_sdk 的客户端发起请求
+        client = _INSTALLED[1]
+        if client is not None:
+            client.head("/", timeout=5)
+    except Exception as e:
+        logger.debug(f"MetaSo 客户端预热失败: {str(e)}")
+
+
+def prewarm_metaso_client() -> None:
+    """在配置 tools.metaso.prewarm 为 true 时，于后台线程预热 MetaSo 客户端；应在配置加载后调用"""
+    tool_config = getattr(app_settings.tools, "metaso", None) or {}
+    if isinstance(tool_config, dict):
+        enabled = tool_config.get("prewarm", False)
+    else:
+        enabled = getattr(tool_config, "prewarm", False)
+    if enabled:
+        threading.Thread(target=_prewarm_metaso_client, name="metaso-prewarm", daemon=True).start()
@@ -11,13 +11,15 @@ from uuid import uuid4
 from agentchat.settings import app_settings
 from agentchat.utils.date_utils import get_beijing_date_str
 
+_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+
 def format_file_size(size_bytes):
-    units = ['B', 'KB', 'MB', 'GB', 'TB']
+    # 每 10 个二进制位升一级单位，直接算出级别，无需逐级除以 1024
     unit_index = 0
-    while size_bytes >= 1024 and unit_index < len(units)-1:
-        size_bytes /= 1024
-        unit_index += 1
-    return f"{round(size_bytes, 2)}{units[unit_index]}"
+    if size_bytes >= 1024:
+        unit_index = min((int(size_bytes).bit_length() - 1) // 10, len(_SIZE_UNITS) - 1)
+        size_bytes /= 1 << (10 * unit_index)
+    return f"{round(size_bytes, 2)}{_SIZE_UNITS[unit_index]}"
 
 def load_file_to_obj(filepath):
     try:
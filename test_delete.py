@@ -5,8 +5,10 @@ import asyncio
 import sys
 import os
 
-# 添加项目路径到Python路径
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src', 'backend'))
+# 直接运行脚本时添加项目路径到Python路径（pytest 运行时由 conftest.py 添加）
+_BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src', 'backend')
+if _BACKEND_DIR not in sys.path:
+    sys.path.insert(0, _BACKEND_DIR)
 
 from agentchat.api.services.knowledge_file import KnowledgeFileService
 
@@ -23,7 +25,14 @@ async def test_delete():
     except Exception as e:
         print(f'捕获未预期异常: {e}')
         import traceback
-        traceback.print_exc()
+        # 默认只输出最内层的几帧，设置 VERBOSE_TB 时输出完整调用栈
+        traceback.print_exc(limit=None if os.environ.get("VERBOSE_TB") else -5)
 
 if __name__ == "__main__":
-    asyncio.run(test_delete())
\ No newline at end of file
+    # 安装了 uvloop 时使用其事件循环，未安装时使用默认事件循环
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(test_delete())
+    else:
+        uvloop.run(test_delete())
\ No newline at end of file
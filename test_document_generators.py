@@ -0,0 +1,80 @@
+"""文档翻译生成器测试"""
+
+import pytest
+
+from agentchat.tools.document_translation import generators
+from agentchat.tools.document_translation.generators import DocumentGenerator, _heading_level
+
+
+@pytest.mark.parametrize('style, level', [
+    ('Heading 1', 1),
+    ('Heading 2', 2),
+    ('Heading 3', 2),
+    ('Heading 10', 1),
+    ('Heading 0', 2),
+    ('Heading', 2),
+    ('Normal', 0),
+    ('Title', 0),
+    ('', 0),
+    (None, 0),
+])
+def test_heading_level(style, level):
+    """标题样式名中含 "1" 的为一级标题，其余标题为二级标题"""
+    assert _heading_level(style) == level
+
+
+@pytest.mark.parametrize('count', [3, generators._DOCX_FAST_PATH_THRESHOLD + 1])
+def test_docx_heading_styles(tmp_path, count):
+    """逐段写入和直接写入 XML 两种方式得到相同的标题样式"""
+    docx = pytest.importorskip('docx')
+    styles = ['Heading 1', 'Heading 3', 'Normal']
+    paragraphs = [{'text': f'p{i}', 'style': styles[i % 3]} for i in range(count)]
+    output_path = str(tmp_path / 'out.docx')
+
+    assert DocumentGenerator().generate({'paragraphs': paragraphs}, output_path)
+
+    doc = docx.Document(output_path)
+    assert [para.style.name for para in doc.paragraphs] == [
+        ['Heading 1', 'Heading 2', 'Normal'][i % 3] for i in range(count)
+    ]
+
+
+def test_empty_txt_is_written_without_generator(tmp_path):
+    """空内容的 TXT 直接输出空文件，不创建生成器"""
+    generator = DocumentGenerator()
+    output_path = tmp_path / 'empty.txt'
+
+    assert generator.generate({}, str(output_path))
+    assert output_path.read_bytes() == b''
+    assert generator._generators == {}
+
+
+@pytest.mark.parametrize('content', [{}, {'text': '', 'metadata': {}}])
+def test_empty_docx_is_a_valid_document(tmp_path, content):
+    """空内容的 DOCX 仍是可以打开的文档"""
+    docx = pytest.importorskip('docx')
+    output_path = str(tmp_path / 'empty.docx')
+
+    assert DocumentGenerator().generate(content, output_path)
+    assert docx.Document(output_path).paragraphs == []
+
+
+def test_empty_pptx_is_a_valid_presentation(tmp_path):
+    """空内容的 PPTX 仍是可以打开的演示文稿"""
+    pptx = pytest.importorskip('pptx')
+    output_path = str(tmp_path / 'empty.pptx')
+
+    assert DocumentGenerator().generate({}, output_path)
+    pptx.Presentation(output_path)
+
+
+def test_empty_pdf_has_one_blank_page(tmp_path):
+    """空内容的 PDF 输出一页空白页"""
+    pytest.importorskip('reportlab')
+    fitz = pytest.importorskip('fitz')
+    output_path = str(tmp_path / 'empty.pdf')
+
+    assert DocumentGenerator().generate({}, output_path)
+    with fitz.open(output_path) as doc:
+        assert len(doc) == 1
+        assert doc[0].get_text().strip() == ''
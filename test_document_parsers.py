@@ -0,0 +1,71 @@
+"""文档翻译解析器测试"""
+
+import pytest
+
+from agentchat.tools.document_translation.parsers import ParserFactory
+
+
+def test_factory_reuses_parser_instances():
+    """相同解析器类和参数共用一个实例，未知格式返回 None"""
+    factory = ParserFactory()
+
+    assert factory.get_parser('.TXT') is factory.get_parser('.txt')
+    assert factory.get_parser('.xyz') is None
+    assert '.docx' in factory.get_supported_formats()
+
+
+def test_txt_parser_normalizes_newlines(tmp_path):
+    """TXT 文件统一换行符后按段落切分"""
+    path = tmp_path / 'in.txt'
+    path.write_bytes('第一段\r\n\r\nsecond paragraph\rline'.encode('utf-8'))
+
+    content = ParserFactory().get_parser('.txt').parse(str(path))
+
+    assert content['text'] == '第一段\n\nsecond paragraph\nline'
+    assert [para['text'] for para in content['paragraphs']] == ['第一段', 'second paragraph\nline']
+    assert content['metadata']['line_count'] == 4
+    assert content['format'] == 'txt'
+
+
+def test_docx_parser_extracts_paragraphs_runs_and_tables(tmp_path):
+    """DOCX 解析保留段落样式、文本运行格式和表格内容"""
+    docx = pytest.importorskip('docx')
+    document = docx.Document()
+    document.add_heading('Title', level=1)
+    para = document.add_paragraph()
+    para.add_run('bold ').bold = True
+    para.add_run('plain')
+    document.add_paragraph('   ')
+    table = document.add_table(rows=1, cols=2)
+    table.cell(0, 0).text = ' a '
+    table.cell(0, 1).text = 'b'
+    path = tmp_path / 'in.docx'
+    document.save(str(path))
+
+    content = ParserFactory().get_parser('.docx').parse(str(path))
+
+    assert [p['text'] for p in content['paragraphs']] == ['Title', 'bold plain']
+    assert content['paragraphs'][0]['style'] == 'Heading 1'
+    assert [(run['text'], run['bold']) for run in content['paragraphs'][1]['runs']] == [
+        ('bold ', True), ('plain', None)
+    ]
+    assert content['tables'] == [[['a', 'b']]]
+    assert content['text'] == 'Title\n\nbold plain'
+    assert content['metadata']['total_paragraphs'] == 2
+    assert content['metadata']['total_tables'] == 1
+
+
+def test_docx_parser_options_skip_runs_and_tables(tmp_path):
+    """关闭对应选项时不提取文本运行和表格"""
+    docx = pytest.importorskip('docx')
+    document = docx.Document()
+    document.add_paragraph('text')
+    document.add_table(rows=1, cols=1).cell(0, 0).text = 'cell'
+    path = tmp_path / 'in.docx'
+    document.save(str(path))
+
+    parser = ParserFactory().get_parser('.docx', extract_tables=False, extract_runs=False)
+    content = parser.parse(str(path))
+
+    assert content['paragraphs'][0].keys() == {'text', 'style', 'alignment'}
+    assert content['tables'] == []
@@ -0,0 +1,114 @@
+"""文档翻译工具片段过滤与去重测试"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from agentchat.tools.document_translation import action
+from agentchat.tools.document_translation.action import _dominant_language, _should_translate, translate_content
+
+
+class _RecordingEngine:
+    """记录提交的翻译片段的假翻译引擎"""
+
+    def __init__(self):
+        self.calls = []
+
+    def translate_batch(self, texts, source_language, target_language):
+        self.calls.append(list(texts))
+        return [f'<{text}>' for text in texts]
+
+
+@pytest.mark.parametrize('text, language', [
+    ('这是一段中文文本', 'zh'),
+    ('これは日本語です', 'ja'),
+    ('日本語の文章です', 'ja'),
+    ('한국어 문장입니다', 'ko'),
+    ('Это русский текст', 'ru'),
+    ('This is English', None),
+    ('Bonjour le monde', None),
+    ('12345 !!', None),
+    ('', None),
+])
+def test_dominant_language(text, language):
+    """按书写系统判断主要语言，拉丁字母无法确定具体语言"""
+    assert _dominant_language(text) == language
+
+
+@pytest.mark.parametrize('text, target, expected', [
+    ('2024-01-01', 'en', False),
+    ('  42 %  ', 'zh', False),
+    ('---', 'zh', False),
+    ('https://example.com/a?b=1', 'zh', False),
+    ('www.example.com', 'zh', False),
+    ('user@example.com', 'zh', False),
+    ('这是一段中文文本', 'zh', False),
+    ('这是一段中文文本', 'en', True),
+    ('Hello world', 'zh', True),
+    ('Hello world', 'en', True),
+    ('访问 https://example.com 了解详情', 'en', True),
+])
+def test_should_translate(text, target, expected):
+    """数字符号、链接、邮箱以及已是目标语言的片段不提交翻译"""
+    assert _should_translate(text, target) is expected
+
+
+def test_translate_content_deduplicates_segments():
+    """重复片段只提交一次，跳过的片段保持原文"""
+    content = {
+        'paragraphs': [
+            {'text': 'Header', 'runs': [{'text': 'Header'}]},
+            {'text': 'Body', 'runs': [{'text': 'Body'}]},
+            {'text': '2024', 'runs': []},
+            {'text': 'Header', 'runs': []},
+        ],
+        'tables': [[['Header', 'https://example.com'], ['Cell', '']]],
+    }
+    engine = _RecordingEngine()
+
+    translated = translate_content(content, 'en', 'zh', engine)
+
+    assert engine.calls == [['Header', 'Body', 'Cell']]
+    assert [para['text'] for para in translated['paragraphs']] == ['<Header>', '<Body>', '2024', '<Header>']
+    assert translated['paragraphs'][0]['runs'][0]['text'] == '<Header>'
+    assert translated['tables'] == [[['<Header>', 'https://example.com'], ['<Cell>', '']]]
+    assert translated['text'] == '<Header>\n\n<Body>\n\n2024\n\n<Header>'
+    # 原始内容不被修改
+    assert content['paragraphs'][0]['text'] == 'Header'
+
+
+def test_translate_content_skips_engine_when_nothing_to_translate():
+    """没有需要翻译的片段时不调用翻译引擎"""
+    engine = _RecordingEngine()
+
+    translated = translate_content({'text': '12345'}, 'auto', 'zh', engine)
+
+    assert engine.calls == []
+    assert translated['text'] == '12345'
+    assert translated['translated_language'] == 'zh'
+
+
+def test_document_translation_processes_duplicate_urls_once(monkeypatch, tmp_path):
+    """重复的文件链接只下载处理一次，结果按原始顺序逐条返回"""
+    downloads = []
+
+    def fake_download(file_url, workdir):
+        downloads.append(file_url)
+        if file_url == 'bad':
+            return None
+        return {'filename': f'{file_url}.txt', 'extension': 'txt', 'file_path': str(tmp_path / file_url)}
+
+    monkeypatch.setattr(action, 'app_settings', SimpleNamespace(tools=SimpleNamespace()))
+    monkeypatch.setattr(action, 'get_translation_engine', lambda config=None: _RecordingEngine())
+    monkeypatch.setattr(action, 'download_and_validate_file', fake_download)
+    monkeypatch.setattr(action, 'parse_document', lambda file_info, *args: {'text': 'Hello'})
+    monkeypatch.setattr(action, 'generate_translated_document', lambda file_info, *args: file_info['file_path'])
+    monkeypatch.setattr(action, 'upload_translated_file',
+                        lambda output_file, file_info: f"https://oss/{file_info['filename']}")
+
+    result = action._document_translation(['u1', 'bad', 'u2', 'u1', 'bad'], 'zh', 'auto', True)
+
+    assert downloads == ['u1', 'bad', 'u2']
+    assert result.count('https://oss/u1.txt') == 2
+    assert result.count('https://oss/u2.txt') == 1
+    assert result.count('文件 bad: 下载或验证失败') == 2
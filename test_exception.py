@@ -21,19 +21,8 @@ def test_exception_handling():
         print(f"✅ 信号处理正常: 收到信号 {signum}")
         # 不退出程序
         
-    # 临时注册信号处理
-    old_handler = signal.signal(signal.SIGTERM, safe_signal_handler)
-    
-    # 模拟信号
-    try:
-        # 发送测试信号给自己
-        import os
-        os.kill(os.getpid(), signal.SIGTERM)
-    except:
-        pass
-    
-    # 恢复原始处理
-    signal.signal(signal.SIGTERM, old_handler)
+    # 直接调用处理函数模拟收到信号，无需真正向自身发送信号
+    safe_signal_handler(signal.SIGTERM, None)
     
     print("✅ 异常处理测试完成")
 
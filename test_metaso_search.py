@@ -0,0 +1,109 @@
+"""MetaSo 联网搜索缓存与批量搜索测试"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from agentchat.tools.web_search.metaso_search import action
+
+
+class _FakeSearchModule:
+    """记录请求次数的假 metaso_sdk.search 模块"""
+
+    def __init__(self):
+        self.questions = []
+
+    def search(self, query, stream=False):
+        self.questions.append(query['question'])
+        return {'text': f"answer {len(self.questions)}"}
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """可手动推进的单调时钟"""
+    now = [1000.0]
+    monkeypatch.setattr(action, 'time', SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+
+@pytest.fixture
+def search_module(monkeypatch):
+    module = _FakeSearchModule()
+    monkeypatch.setattr(action, '_SEARCH_MOD', module)
+    monkeypatch.setattr(action, '_QUERY_FACTORY', dict)
+    action.clear_search_cache()
+    yield module
+    action.clear_search_cache()
+
+
+def test_search_result_is_cached_until_expiry(clock, search_module):
+    """非流式搜索结果在有效期内复用，过期后重新请求"""
+    assert action._run_metaso_search('q', None, False, None) == 'answer 1'
+    clock[0] += action._SEARCH_CACHE_TTL - 1
+    assert action._run_metaso_search('q', None, False, None) == 'answer 1'
+    assert search_module.questions == ['q']
+
+    clock[0] += 1
+    assert action._run_metaso_search('q', None, False, None) == 'answer 2'
+    assert search_module.questions == ['q', 'q']
+
+
+def test_search_cache_is_keyed_by_session_and_shared_across_max_chars(clock, search_module):
+    """缓存按问题和会话区分，不同的 max_chars 共用同一条缓存"""
+    assert action._run_metaso_search('q', None, False, 3) == 'ans'
+    assert action._run_metaso_search('q', '', False, None) == 'answer 1'
+    assert action._run_metaso_search('q', 's1', False, None) == 'answer 2'
+    assert search_module.questions == ['q', 'q']
+
+
+def test_search_cache_evicts_least_recently_used(clock, search_module, monkeypatch):
+    """超过容量时淘汰最久未使用的条目"""
+    monkeypatch.setattr(action, '_SEARCH_CACHE_SIZE', 2)
+    for query in ('a', 'b', 'a', 'c'):
+        action._run_metaso_search(query, None, False, None)
+
+    assert list(action._SEARCH_CACHE) == [('a', None), ('c', None)]
+
+
+def test_stream_search_bypasses_cache(clock, search_module):
+    """流式搜索不读写缓存"""
+    search_module.search = lambda query, stream=False: iter(['x', {'text': 'y'}])
+
+    assert action._run_metaso_search('q', None, True, None) == 'xy'
+    assert action._SEARCH_CACHE == {}
+
+
+def test_search_batch_runs_each_unique_query_once(monkeypatch):
+    """批量搜索对重复问题只请求一次，结果按原始顺序返回，单个失败不影响其他问题"""
+    calls = []
+
+    def fake_search(query, session_id, stream, max_chars):
+        calls.append((query, session_id, stream, max_chars))
+        if query == 'bad':
+            raise RuntimeError('boom')
+        return f'result of {query}'
+
+    monkeypatch.setattr(action, '_get_metaso_api_key', lambda: 'key')
+    monkeypatch.setattr(action, '_refresh_metaso_client', lambda api_key: None)
+    monkeypatch.setattr(action, '_run_metaso_search', fake_search)
+    search_batch = getattr(action.metaso_search_batch, 'func', action.metaso_search_batch)
+
+    result = search_batch(['a', 'bad', 'b', 'a'], max_chars=50)
+
+    assert sorted(calls) == [('a', None, False, 50), ('b', None, False, 50), ('bad', None, False, 50)]
+    assert result == '\n\n'.join([
+        '【a】\nresult of a',
+        '【bad】\n搜索失败: boom',
+        '【b】\nresult of b',
+        '【a】\nresult of a',
+    ])
+
+
+def test_search_batch_requires_api_key(monkeypatch):
+    """未配置 API Key 时批量搜索报错，空列表直接返回"""
+    monkeypatch.setattr(action, '_get_metaso_api_key', lambda: None)
+    search_batch = getattr(action.metaso_search_batch, 'func', action.metaso_search_batch)
+
+    assert search_batch([]) == ''
+    with pytest.raises(ValueError):
+        search_batch(['q'])
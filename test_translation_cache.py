@@ -0,0 +1,116 @@
+"""文档翻译缓存与百度批量翻译测试"""
+
+import time
+
+from agentchat.tools.document_translation import cache
+from agentchat.tools.document_translation.cache import (
+    SQLiteTranslationCache,
+    create_translation_cache,
+    make_cache_key,
+)
+from agentchat.tools.document_translation.translators import BaiduTranslator, TranslationEngine
+
+
+class _UpperTranslator:
+    """把文本转为大写的假翻译器，记录批量调用次数"""
+
+    max_batch_bytes = None
+
+    def __init__(self):
+        self.calls = 0
+
+    def translate_batch(self, texts, source_language, target_language):
+        self.calls += 1
+        return [text.upper() for text in texts]
+
+
+class _BrokenCache:
+    """读写都抛出异常的持久化缓存"""
+
+    def get_many(self, keys):
+        raise RuntimeError("cache unavailable")
+
+    def set_many(self, items):
+        raise RuntimeError("cache unavailable")
+
+    def close(self):
+        pass
+
+
+def test_sqlite_cache_round_trip(tmp_path):
+    """写入的条目可以读出，未写入的键返回 None，重新打开文件后仍可命中"""
+    path = str(tmp_path / 'cache.sqlite3')
+    key = make_cache_key('hello', 'en', 'zh')
+    store = SQLiteTranslationCache(path)
+    store.set_many([(key, '你好')])
+    assert store.get_many([key, 'missing']) == ['你好', None]
+    store.close()
+
+    reopened = SQLiteTranslationCache(path)
+    assert reopened.get_many([key]) == ['你好']
+    reopened.close()
+
+
+def test_sqlite_cache_expiry(tmp_path, monkeypatch):
+    """超过有效期的条目不再命中"""
+    store = SQLiteTranslationCache(str(tmp_path / 'cache.sqlite3'), ttl=10)
+    store.set_many([('k', 'v')])
+    assert store.get_many(['k']) == ['v']
+
+    now = time.time()
+    monkeypatch.setattr(cache.time, 'time', lambda: now + 11)
+    assert store.get_many(['k']) == [None]
+    store.close()
+
+
+def test_sqlite_cache_more_keys_than_query_chunk(tmp_path):
+    """键数超过单条查询的分批大小时，结果仍与 keys 顺序一致"""
+    count = cache._SQLITE_QUERY_CHUNK * 2 + 7
+    items = [(f'k{i}', f'v{i}') for i in range(count)]
+    store = SQLiteTranslationCache(str(tmp_path / 'cache.sqlite3'))
+    store.set_many(items)
+
+    keys = [key for key, _ in reversed(items)] + ['missing']
+    assert store.get_many(keys) == [value for _, value in reversed(items)] + [None]
+    store.close()
+
+
+def test_create_translation_cache_falls_back_on_error(tmp_path):
+    """缓存无法创建时返回 None，只使用内存缓存"""
+    config = {'cache_backend': 'disk', 'cache_path': str(tmp_path / 'missing' / 'cache.sqlite3')}
+    assert create_translation_cache(config) is None
+    assert create_translation_cache({}) is None
+
+
+def test_engine_translates_when_persistent_cache_fails():
+    """持久化缓存读写失败时照常翻译，结果仍进入内存缓存"""
+    engine = TranslationEngine()
+    translator = _UpperTranslator()
+    engine.translators = [translator]
+    engine._persistent_cache = _BrokenCache()
+    try:
+        assert engine.translate_batch(['a', 'b'], 'en', 'zh') == ['A', 'B']
+        assert engine.translate_batch(['a', 'b'], 'en', 'zh') == ['A', 'B']
+        assert translator.calls == 1
+    finally:
+        engine.close()
+
+
+def test_baidu_batch_falls_back_when_line_count_differs():
+    """百度返回的行数与请求不一致时，改为逐条翻译"""
+    translator = BaiduTranslator('app', 'key')
+    queries = []
+
+    def fake_request_lines(text, source_language, target_language):
+        queries.append(text)
+        if '\n' in text:
+            # 合并请求只返回了一行
+            return ['merged']
+        return [text.upper()]
+
+    translator._request_lines = fake_request_lines
+    try:
+        assert translator.translate_batch(['one', 'two', 'three'], 'en', 'zh') == ['ONE', 'TWO', 'THREE']
+        assert queries == ['one\ntwo\nthree', 'one', 'two', 'three']
+    finally:
+        translator.session.close()
@@ -0,0 +1,90 @@
+"""文档翻译引擎分批与批量请求测试"""
+
+import orjson
+
+from agentchat.tools.document_translation.translators import (
+    BaiduTranslator, GoogleTranslator, TranslationEngine, _iter_batches
+)
+
+
+class _RecordingTranslator:
+    """记录每次批量请求内容的假翻译器"""
+
+    def __init__(self, max_batch_bytes=None):
+        self.max_batch_bytes = max_batch_bytes
+        self.batches = []
+
+    def translate_batch(self, texts, source_language, target_language):
+        self.batches.append(list(texts))
+        return [f'[{text}]' for text in texts]
+
+
+def test_iter_batches_by_chars_and_items():
+    """按字符数和条目数上限分批，超长的单条文本单独成批"""
+    texts = ['a' * 4, 'b' * 4, 'c' * 20, 'd', 'e', 'f']
+    assert list(_iter_batches(range(6), texts, max_chars=10, max_items=2)) == [[0, 1], [2], [3, 4], [5]]
+
+
+def test_iter_batches_by_utf8_bytes():
+    """设置字节数上限时按拼接后的 UTF-8 字节数分批"""
+    texts = ['中文' * 10] * 5  # 每条 60 字节，加分隔符 61 字节
+    batches = list(_iter_batches(range(5), texts, max_chars=5000, max_items=50, max_bytes=130))
+    assert batches == [[0, 1], [2, 3], [4]]
+
+
+def test_engine_keeps_baidu_batches_under_byte_limit():
+    """百度翻译的合并请求按字节数分批，不超过接口长度限制"""
+    assert BaiduTranslator.max_batch_bytes == 6000
+
+    engine = TranslationEngine()
+    translator = _RecordingTranslator(max_batch_bytes=BaiduTranslator.max_batch_bytes)
+    engine.translators = [translator]
+    texts = [f'{i:03d}' + '中' * 100 for i in range(200)]
+    try:
+        assert engine.translate_batch(texts, 'zh', 'en') == [f'[{text}]' for text in texts]
+    finally:
+        engine.close()
+
+    assert sorted(text for batch in translator.batches for text in batch) == texts
+    for batch in translator.batches:
+        assert len('\n'.join(batch).encode('utf-8')) <= 6000
+
+
+class _FakeResponse:
+    def __init__(self, payload):
+        self.content = orjson.dumps(payload)
+
+    def raise_for_status(self):
+        pass
+
+
+class _FakeSession:
+    """记录请求参数并返回固定响应的假 requests 会话"""
+
+    def __init__(self, payload):
+        self.payload = payload
+        self.requests = []
+
+    def post(self, url, **kwargs):
+        self.requests.append(kwargs)
+        return _FakeResponse(self.payload)
+
+
+def test_google_translate_batch_sends_one_request():
+    """Google 批量翻译将全部文本作为多个 q 参数放在一次请求的请求体中"""
+    session = _FakeSession({'data': {'translations': [{'translatedText': 'A'}, {'translatedText': 'B'}]}})
+    translator = GoogleTranslator(api_key='key', session=session)
+
+    assert translator.translate_batch(['a', 'b'], 'auto', 'zh') == ['A', 'B']
+    assert len(session.requests) == 1
+    request = session.requests[0]
+    assert request['params'] == {'key': 'key'}
+    assert request['data'] == [('q', 'a'), ('q', 'b'), ('target', 'zh-CN'), ('source', ''), ('format', 'text')]
+
+
+def test_google_translate_batch_returns_originals_on_mismatch():
+    """返回条数与请求不一致时保留原文"""
+    session = _FakeSession({'data': {'translations': [{'translatedText': 'A'}]}})
+    translator = GoogleTranslator(api_key='key', session=session)
+
+    assert translator.translate_batch(['a', 'b'], 'en', 'zh') == ['a', 'b']